@@ -17,7 +17,7 @@ async function setupDatabase() {
     await pool.query(schema);
     
     console.log('✅ Database setup complete!');
-    console.log('📊 Tables created: users, health_records');
+    console.log('📊 Tables created: users, health_records, user_history_summaries, health_record_deletions');
     console.log('🔑 Test user created: test@example.com');
     
   } catch (error) {
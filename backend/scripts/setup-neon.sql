@@ -45,8 +45,24 @@ CREATE TABLE IF NOT EXISTS health_records (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Rolling per-user history digest (refreshed on record writes, used for AI prompts)
+CREATE TABLE IF NOT EXISTS user_history_summaries (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    summary JSONB NOT NULL,      -- sites, symptoms, severity trajectory, episodes
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Tombstones so delta sync (?since=) can report deleted records
+CREATE TABLE IF NOT EXISTS health_record_deletions (
+    record_id INTEGER PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Index for faster queries
 CREATE INDEX IF NOT EXISTS idx_health_records_user_date ON health_records(user_id, record_date DESC);
+CREATE INDEX IF NOT EXISTS idx_health_records_user_updated ON health_records(user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_health_record_deletions_user ON health_record_deletions(user_id, deleted_at);
 
 -- Verify tables
 SELECT 'Tables created successfully' as status;
\ No newline at end of file
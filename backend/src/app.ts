@@ -5,6 +5,7 @@ import dotenv from 'dotenv';
 import routes from './routes';
 import { errorHandler, notFoundHandler } from './middleware/errorHandler';
 import { requestLogger } from './middleware/logger';
+import { compressJson } from './middleware/compression';
 
 // Load environment variables
 dotenv.config();
@@ -31,8 +32,8 @@ app.use(cors({
   },
   credentials: true,
   methods: ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS', 'PATCH'],
-  allowedHeaders: ['Content-Type', 'Authorization', 'X-Requested-With'],
-  exposedHeaders: ['X-Total-Count'],
+  allowedHeaders: ['Content-Type', 'Authorization', 'X-Requested-With', 'If-None-Match'],
+  exposedHeaders: ['X-Total-Count', 'Server-Timing', 'ETag'],
   maxAge: 86400
 }));
 
@@ -46,6 +47,9 @@ app.use(express.urlencoded({ extended: true }));
 // Request logging - Industry standard
 app.use(requestLogger);
 
+// Negotiated gzip/brotli for large JSON payloads
+app.use(compressJson());
+
 // Root route
 app.get('/', (req, res) => {
   res.json({
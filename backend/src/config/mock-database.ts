@@ -1,14 +1,18 @@
+import { logger } from '../utils/Logger';
+
 // Mock database for development when no database is available
 export const mockDatabase = {
   users: [
     { id: 1, email: 'test@example.com', password: '$2a$10$example', created_at: new Date() }
   ],
-  health_records: [] as any[]
+  health_records: [] as any[],
+  history_summaries: new Map<number, any>(),
+  deletions: [] as any[]
 };
 
 export const mockPool = {
   query: async (text: string, params?: any[]) => {
-    console.log('🔧 Mock database query:', text.substring(0, 50) + '...');
+    logger.debug('Mock database query', { query: text.substring(0, 50) });
     
     // Mock responses for different queries
     if (text.includes('SELECT NOW()')) {
@@ -85,6 +89,66 @@ export const mockPool = {
       return { rows: [] };
     }
     
+    if (text.includes('SELECT summary FROM user_history_summaries')) {
+      const summary = mockDatabase.history_summaries.get(params?.[0]);
+      return { rows: summary ? [{ summary }] : [] };
+    }
+    
+    if (text.includes('INSERT INTO user_history_summaries')) {
+      if (mockDatabase.history_summaries.has(params?.[0])) return { rows: [], rowCount: 0 };
+      mockDatabase.history_summaries.set(params?.[0], JSON.parse(params?.[1]));
+      return { rows: [], rowCount: 1 };
+    }
+    
+    if (text.includes('UPDATE user_history_summaries')) {
+      const current = mockDatabase.history_summaries.get(params?.[0]);
+      if (!current || (current.revision || 0) !== params?.[2]) return { rows: [], rowCount: 0 };
+      mockDatabase.history_summaries.set(params?.[0], JSON.parse(params?.[1]));
+      return { rows: [], rowCount: 1 };
+    }
+    
+    if (text.includes('SELECT record_date, site, symptoms, severity FROM health_records')) {
+      const userId = params?.[0];
+      return { rows: mockDatabase.health_records.filter(r => r.user_id === userId) };
+    }
+    
+    if (text.includes('DELETE FROM health_records')) {
+      const index = mockDatabase.health_records.findIndex(r => r.id === params?.[0] && r.user_id === params?.[1]);
+      if (index === -1) return { rows: [], rowCount: 0 };
+      mockDatabase.health_records.splice(index, 1);
+      mockDatabase.deletions.push({ record_id: params?.[0], user_id: params?.[1], deleted_at: new Date() });
+      return { rows: [], rowCount: 1 };
+    }
+    
+    if (text.includes('COUNT(*)::int AS count')) {
+      const records = mockDatabase.health_records.filter(r => r.user_id === params?.[0]);
+      return {
+        rows: [{
+          count: records.length,
+          last_updated: records.reduce((max, r) => (!max || r.updated_at > max ? r.updated_at : max), null),
+          id_sum: records.reduce((sum, r) => sum + r.id, 0)
+        }]
+      };
+    }
+    
+    if (text.includes('AND updated_at > $2')) {
+      const userId = params?.[0];
+      const since = new Date(params?.[1]);
+      const rows = mockDatabase.health_records
+        .filter(r => r.user_id === userId && r.updated_at > since)
+        .map(r => ({ ...r, sync_cursor: r.updated_at.toISOString().replace('Z', '000Z') }));
+      return { rows };
+    }
+    
+    if (text.includes('FROM health_record_deletions')) {
+      const userId = params?.[0];
+      const since = new Date(params?.[1]);
+      const rows = mockDatabase.deletions
+        .filter(d => d.user_id === userId && d.deleted_at > since)
+        .map(d => ({ record_id: d.record_id, sync_cursor: d.deleted_at.toISOString().replace('Z', '000Z') }));
+      return { rows };
+    }
+    
     if (text.includes('health_records')) {
       return { rows: mockDatabase.health_records };
     }
@@ -1,10 +1,14 @@
 import { Request, Response } from 'express';
 import { HealthRecordService } from '../services/HealthRecordService';
 import { AnalysisService } from '../services/AnalysisService';
+import { HistorySummaryService } from '../services/HistorySummaryService';
 import { CreateHealthRecordDto, ApiResponse } from '../types';
 import { asyncHandler } from '../middleware/errorHandler';
+import { strongETag, notModified } from '../utils/HttpCache';
 
 export class HealthRecordController {
+  private static readonly SYNC_CURSOR = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?Z$/;
+
   static createRecord = asyncHandler(async (req: Request, res: Response): Promise<void> => {
     const userId = req.user!.id;
     const recordData: CreateHealthRecordDto = req.body;
@@ -24,6 +28,30 @@ export class HealthRecordController {
     const userId = req.user!.id;
     const limit = req.query.limit ? parseInt(req.query.limit as string) : undefined;
     
+    // Delta sync: only rows changed or deleted after the client's cursor
+    if (req.query.since) {
+      // Passed to Postgres as-is to keep microsecond cursors exact, so only ISO UTC is accepted
+      const since = req.query.since as string;
+      if (!HealthRecordController.SYNC_CURSOR.test(since) || isNaN(Date.parse(since))) {
+        res.status(400).json({ success: false, error: 'Invalid since timestamp' });
+        return;
+      }
+      
+      const delta = await HealthRecordService.getChangesSince(userId, since);
+      const response: ApiResponse = {
+        success: true,
+        data: delta,
+        message: 'Health record changes retrieved successfully'
+      };
+      res.json(response);
+      return;
+    }
+    
+    // Validate against a cheap aggregate before loading and serializing rows
+    const version = await HealthRecordService.getCollectionVersion(userId);
+    const etag = strongETag('records', userId, limit, version.count, version.last_updated, version.id_sum);
+    if (notModified(req, res, etag)) return;
+    
     const records = await HealthRecordService.getUserRecords(userId, limit);
     
     const response: ApiResponse = {
@@ -40,6 +68,7 @@ export class HealthRecordController {
     const recordId = parseInt(req.params.id);
     
     const record = await HealthRecordService.getRecordById(recordId, userId);
+    if (notModified(req, res, strongETag('record', record.id, record.updated_at))) return;
     
     const response: ApiResponse = {
       success: true,
@@ -54,15 +83,14 @@ export class HealthRecordController {
     const userId = req.user!.id;
     const recordId = parseInt(req.params.recordId);
     
-    // Get current record and user's health history
+    // Get current record and the user's rolling history digest
     const record = await HealthRecordService.getRecordById(recordId, userId);
-    const userHistory = await HealthRecordService.getUserRecords(userId, 10); // Last 10 records
-    
-    // Filter out current record from history
-    const pastRecords = userHistory.filter(r => r.id !== recordId);
+    const summary = await HistorySummaryService.getSummary(userId);
     
-    // Analyze with full context
-    const analysis = await AnalysisService.analyzeHealthRecord(record, pastRecords, userId.toString());
+    // Analyze with full context (bounded-size summary instead of raw history rows)
+    const analysis = await AnalysisService.analyzeHealthRecord(
+      record, undefined, userId.toString(), HistorySummaryService.toPrompt(summary, record)
+    );
     
     // Auto-save analysis to database
     await HealthRecordService.updateRecordAnalysis(recordId, analysis);
@@ -76,6 +104,23 @@ export class HealthRecordController {
     res.json(response);
   });
 
+  static getStoredAnalysis = asyncHandler(async (req: Request, res: Response): Promise<void> => {
+    const userId = req.user!.id;
+    const recordId = parseInt(req.params.recordId);
+    
+    // Previously saved analysis only - never triggers a new AI call
+    const record = await HealthRecordService.getRecordById(recordId, userId);
+    if (notModified(req, res, strongETag('analysis', record.id, record.updated_at))) return;
+    
+    const response: ApiResponse = {
+      success: true,
+      data: record.ai_analysis || null,
+      message: record.ai_analysis ? 'Stored analysis retrieved successfully' : 'No stored analysis for this record'
+    };
+    
+    res.json(response);
+  });
+
   static updateRecord = asyncHandler(async (req: Request, res: Response): Promise<void> => {
     const userId = req.user!.id;
     const recordId = parseInt(req.params.id);
@@ -109,10 +154,11 @@ export class HealthRecordController {
   static getOverallAnalysis = asyncHandler(async (req: Request, res: Response): Promise<void> => {
     const userId = req.user!.id;
     
-    // Get all user records
-    const records = await HealthRecordService.getUserRecords(userId, 20);
+    // Rolling digest covers the whole journal; only the latest record is loaded
+    const summary = await HistorySummaryService.getSummary(userId);
+    const [latest] = await HealthRecordService.getUserRecords(userId, 1);
     
-    if (records.length === 0) {
+    if (summary.totalRecords === 0 || !latest) {
       const response: ApiResponse = {
         success: true,
         data: {
@@ -126,31 +172,19 @@ export class HealthRecordController {
       return;
     }
 
-    // Create summary query for AI
-    const recentRecords = records.slice(0, 10);
-    const query = `Overall Health Summary Analysis:
-
-Patient has ${records.length} health records. Recent symptoms:
-${recentRecords.map((r, i) => `${i + 1}. [${r.record_date}] ${r.symptoms} (Severity: ${r.severity}/10, Site: ${r.site})`).join('\n')}
-
-Provide:
-1. Overall health pattern analysis
-2. Recurring symptoms or conditions
-3. Severity trends over time
-4. Key recommendations for long-term health management
-5. Any concerning patterns requiring medical attention`;
-
     // Get AI analysis
-    const analysis = await AnalysisService.analyzeHealthRecord(recentRecords[0], recentRecords.slice(1), userId.toString());
+    const analysis = await AnalysisService.analyzeHealthRecord(
+      latest, undefined, userId.toString(), HistorySummaryService.toPrompt(summary, latest)
+    );
     
     const response: ApiResponse = {
       success: true,
       data: {
         ...analysis,
-        totalRecords: records.length,
+        totalRecords: summary.totalRecords,
         dateRange: {
-          earliest: records[records.length - 1]?.record_date,
-          latest: records[0]?.record_date
+          earliest: summary.firstDate,
+          latest: summary.lastDate
         }
       },
       message: 'Overall health analysis completed'
@@ -27,9 +27,32 @@ export const authMiddleware = (req: Request, res: Response, next: NextFunction):
     req.user = decoded;
     next();
   } catch (error) {
-    res.status(400).json({ 
+    // Expired or tampered tokens are an authentication failure, not a bad request
+    res.status(401).json({ 
       success: false, 
-      error: 'Invalid token.' 
+      error: 'Invalid or expired token.' 
     });
   }
-};
\ No newline at end of file
+};
+
+/**
+ * Operator-only routes (metrics, slow request log). Admins are listed by email
+ * in ADMIN_EMAILS (comma-separated); with none configured, access is denied.
+ * Must run after authMiddleware.
+ */
+export const requireAdmin = (req: Request, res: Response, next: NextFunction): void => {
+  const admins = (process.env.ADMIN_EMAILS || '')
+    .split(',')
+    .map(email => email.trim().toLowerCase())
+    .filter(Boolean);
+
+  if (!req.user || !admins.includes(req.user.email.toLowerCase())) {
+    res.status(403).json({
+      success: false,
+      error: 'Access denied.'
+    });
+    return;
+  }
+
+  next();
+};
@@ -0,0 +1,74 @@
+import { Request, Response, NextFunction } from 'express';
+import zlib from 'zlib';
+import { promisify } from 'util';
+
+const brotli = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+type Encoding = 'br' | 'gzip';
+
+/**
+ * Pick the best supported encoding from Accept-Encoding (q-values honoured)
+ */
+const negotiate = (header: string | undefined): Encoding | null => {
+  if (!header) return null;
+
+  const accepted = new Map<string, number>();
+  for (const part of header.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.find(p => p.trim().startsWith('q='));
+    accepted.set(name, q ? parseFloat(q.trim().slice(2)) : 1);
+  }
+
+  const quality = (encoding: Encoding) => accepted.get(encoding) ?? accepted.get('*') ?? 0;
+  if (quality('br') > 0 && quality('br') >= quality('gzip')) return 'br';
+  if (quality('gzip') > 0) return 'gzip';
+  return null;
+};
+
+/**
+ * JSON response compression middleware - Industry standard
+ * Negotiates brotli/gzip for payloads above the threshold (large analyses),
+ * compressing off the event loop via zlib's thread pool
+ */
+export const compressJson = (threshold: number = 1024) => {
+  return (req: Request, res: Response, next: NextFunction): void => {
+    const json = res.json.bind(res);
+
+    res.json = (body: any) => {
+      res.vary('Accept-Encoding');
+
+      const encoding = negotiate(req.header('Accept-Encoding'));
+      if (!encoding || req.method === 'HEAD' || res.getHeader('Content-Encoding')) {
+        return json(body);
+      }
+
+      const payload = Buffer.from(JSON.stringify(body));
+      if (payload.length < threshold) {
+        return json(body);
+      }
+
+      const compress = encoding === 'br'
+        ? brotli(payload, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } })
+        : gzip(payload);
+
+      compress.then(compressed => {
+        const etag = res.getHeader('ETag');
+        if (typeof etag === 'string' && !etag.startsWith('W/')) {
+          // Strong validators must differ per content-coding
+          res.setHeader('ETag', etag.replace(/"$/, `-${encoding}"`));
+        }
+        res.setHeader('Content-Type', 'application/json; charset=utf-8');
+        res.setHeader('Content-Encoding', encoding);
+        res.setHeader('Content-Length', compressed.length);
+        res.end(compressed);
+      }).catch(() => {
+        json(body);
+      });
+
+      return res;
+    };
+
+    next();
+  };
+};
@@ -5,6 +5,14 @@ export interface AppError extends Error {
   isOperational?: boolean;
 }
 
+// Operational error carrying the HTTP status errorHandler should send
+export const createError = (message: string, statusCode: number): AppError => {
+  const error: AppError = new Error(message);
+  error.statusCode = statusCode;
+  error.isOperational = true;
+  return error;
+};
+
 export const errorHandler = (
   err: AppError,
   req: Request,
@@ -1,26 +1,69 @@
 import { Request, Response, NextFunction } from 'express';
+import { logger } from '../utils/Logger';
+import { tracer, Trace, slowRequests } from '../utils/Tracing';
+
+/**
+ * Payload shape without values (health data never reaches the log),
+ * e.g. { severity: 'number', vital_signs: { pulse: 'string' } }
+ */
+const shapeOf = (value: any, depth: number = 0): any => {
+  if (value === null) return 'null';
+  if (Array.isArray(value)) return 'array';
+  if (typeof value !== 'object') return typeof value;
+  if (depth >= 2) return 'object';
+
+  const shape: Record<string, any> = {};
+  for (const key of Object.keys(value)) {
+    shape[key] = shapeOf(value[key], depth + 1);
+  }
+  return shape;
+};
 
 /**
  * Request logging middleware - Industry standard
- * Logs all API requests with timing and status
+ * Traces each request, emits Server-Timing, logs structured JSON
+ * and records slow requests in a ring buffer
  */
 export const requestLogger = (req: Request, res: Response, next: NextFunction) => {
-  const start = Date.now();
-  
-  // Log request
-  console.log(`[${new Date().toISOString()}] ${req.method} ${req.path}`);
-  
-  // Log response when finished
+  const trace = new Trace();
+
+  // Server-Timing must be set before headers are flushed
+  const writeHead = res.writeHead;
+  res.writeHead = function (this: Response, ...args: any[]) {
+    if (!res.headersSent) {
+      res.setHeader('Server-Timing', trace.toServerTiming());
+    }
+    return (writeHead as Function).apply(this, args);
+  } as any;
+
   res.on('finish', () => {
-    const duration = Date.now() - start;
-    const statusColor = res.statusCode >= 400 ? '\x1b[31m' : '\x1b[32m';
-    const resetColor = '\x1b[0m';
-    
-    console.log(
-      `[${new Date().toISOString()}] ${req.method} ${req.path} ` +
-      `${statusColor}${res.statusCode}${resetColor} - ${duration}ms`
-    );
+    const duration = Math.round(trace.elapsed() * 10) / 10;
+    // req.path is relative to the sub-router by now; originalUrl is the full request path
+    const path = req.originalUrl.split('?')[0];
+    const route = req.route ? `${req.baseUrl}${req.route.path}` : path;
+    const slow = duration >= slowRequests.thresholdMs;
+    const entry = {
+      method: req.method,
+      route,
+      path,
+      status: res.statusCode,
+      duration,
+      spans: trace.getSpans(),
+      query: Object.keys(req.query),
+      ...(req.body && Object.keys(req.body).length > 0 && { bodyShape: shapeOf(req.body) })
+    };
+
+    if (slow) {
+      slowRequests.log.push({ timestamp: new Date().toISOString(), ...entry });
+    }
+
+    // Errors and slow requests are always logged; the rest are sampled
+    if (slow || res.statusCode >= 500) {
+      logger.warn('request', entry);
+    } else if (logger.shouldSample()) {
+      logger.info('request', entry);
+    }
   });
-  
-  next();
+
+  tracer.run(trace, () => next());
 };
@@ -1,5 +1,6 @@
 import { pool } from '../config/database';
-import { HealthRecord, CreateHealthRecordDto } from '../types';
+import { tracer } from '../utils/Tracing';
+import { HealthRecord, CreateHealthRecordDto, RecordCollectionVersion } from '../types';
 
 export class HealthRecordModel {
   static async create(userId: number, recordData: CreateHealthRecordDto): Promise<HealthRecord> {
@@ -33,7 +34,7 @@ export class HealthRecordModel {
       recordData.personal_notes
     ];
     
-    const result = await pool.query(query, values);
+    const result = await tracer.span('db', () => pool.query(query, values));
     return result.rows[0];
   }
 
@@ -43,19 +44,46 @@ export class HealthRecordModel {
       WHERE user_id = $1 
       ORDER BY record_date DESC, record_time DESC 
       LIMIT $2`;
-    const result = await pool.query(query, [userId, limit]);
+    const result = await tracer.span('db', () => pool.query(query, [userId, limit]));
+    return result.rows;
+  }
+
+  static async getVersion(userId: number): Promise<RecordCollectionVersion> {
+    const query = `
+      SELECT COUNT(*)::int AS count, MAX(updated_at) AS last_updated, COALESCE(SUM(id), 0)::bigint AS id_sum
+      FROM health_records WHERE user_id = $1`;
+    const result = await tracer.span('db', () => pool.query(query, [userId]));
+    return result.rows[0];
+  }
+
+  // sync_cursor keeps updated_at's microseconds, which a JS Date would truncate
+  static async findChangedSince(userId: number, since: string): Promise<(HealthRecord & { sync_cursor: string })[]> {
+    const query = `
+      SELECT *, to_char(updated_at, 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS sync_cursor FROM health_records
+      WHERE user_id = $1 AND updated_at > $2::timestamp
+      ORDER BY updated_at ASC`;
+    const result = await tracer.span('db', () => pool.query(query, [userId, since]));
+    return result.rows;
+  }
+
+  static async findDeletedSince(userId: number, since: string): Promise<{ record_id: number; sync_cursor: string }[]> {
+    const query = `
+      SELECT record_id, to_char(deleted_at, 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS sync_cursor FROM health_record_deletions
+      WHERE user_id = $1 AND deleted_at > $2::timestamp
+      ORDER BY deleted_at ASC`;
+    const result = await tracer.span('db', () => pool.query(query, [userId, since]));
     return result.rows;
   }
 
   static async findById(recordId: number, userId: number): Promise<HealthRecord | null> {
     const query = 'SELECT * FROM health_records WHERE id = $1 AND user_id = $2';
-    const result = await pool.query(query, [recordId, userId]);
+    const result = await tracer.span('db', () => pool.query(query, [recordId, userId]));
     return result.rows[0] || null;
   }
 
   static async updateAnalysis(recordId: number, analysis: any): Promise<void> {
     const query = 'UPDATE health_records SET ai_analysis = $1, updated_at = CURRENT_TIMESTAMP WHERE id = $2';
-    await pool.query(query, [JSON.stringify(analysis), recordId]);
+    await tracer.span('db', () => pool.query(query, [JSON.stringify(analysis), recordId]));
   }
 
   static async update(recordId: number, userId: number, recordData: CreateHealthRecordDto): Promise<HealthRecord | null> {
@@ -78,13 +106,17 @@ export class HealthRecordModel {
       recordId, userId
     ];
     
-    const result = await pool.query(query, values);
+    const result = await tracer.span('db', () => pool.query(query, values));
     return result.rows[0] || null;
   }
 
   static async delete(recordId: number, userId: number): Promise<boolean> {
-    const query = 'DELETE FROM health_records WHERE id = $1 AND user_id = $2';
-    const result = await pool.query(query, [recordId, userId]);
+    // Delete and leave a tombstone for delta sync in one statement
+    const query = `
+      WITH deleted AS (DELETE FROM health_records WHERE id = $1 AND user_id = $2 RETURNING id, user_id)
+      INSERT INTO health_record_deletions (record_id, user_id)
+      SELECT id, user_id FROM deleted`;
+    const result = await tracer.span('db', () => pool.query(query, [recordId, userId]));
     return result.rowCount !== null && result.rowCount > 0;
   }
 }
\ No newline at end of file
@@ -0,0 +1,43 @@
+import { pool } from '../config/database';
+import { tracer } from '../utils/Tracing';
+import { HealthRecord, HistorySummary } from '../types';
+
+export class HistorySummaryModel {
+  static async findByUserId(userId: number): Promise<HistorySummary | null> {
+    const query = 'SELECT summary FROM user_history_summaries WHERE user_id = $1';
+    const result = await tracer.span('db', () => pool.query(query, [userId]));
+    return result.rows[0]?.summary || null;
+  }
+
+  /**
+   * Insert the first digest for a user; false if another writer got there first
+   */
+  static async insertIfAbsent(userId: number, summary: HistorySummary): Promise<boolean> {
+    const query = `
+      INSERT INTO user_history_summaries (user_id, summary, updated_at)
+      VALUES ($1, $2, CURRENT_TIMESTAMP)
+      ON CONFLICT (user_id) DO NOTHING`;
+    const result = await tracer.span('db', () => pool.query(query, [userId, JSON.stringify(summary)]));
+    return result.rowCount !== null && result.rowCount > 0;
+  }
+
+  /**
+   * Compare-and-swap on the stored revision; false if the digest changed since it was read
+   */
+  static async updateIfRevision(userId: number, summary: HistorySummary, expectedRevision: number): Promise<boolean> {
+    const query = `
+      UPDATE user_history_summaries SET summary = $2, updated_at = CURRENT_TIMESTAMP
+      WHERE user_id = $1 AND COALESCE((summary->>'revision')::int, 0) = $3`;
+    const result = await tracer.span('db', () => pool.query(query, [userId, JSON.stringify(summary), expectedRevision]));
+    return result.rowCount !== null && result.rowCount > 0;
+  }
+
+  static async findDigestRows(userId: number): Promise<HealthRecord[]> {
+    const query = `
+      SELECT record_date, site, symptoms, severity FROM health_records
+      WHERE user_id = $1
+      ORDER BY record_date ASC, record_time ASC`;
+    const result = await tracer.span('db', () => pool.query(query, [userId]));
+    return result.rows;
+  }
+}
@@ -7,6 +7,7 @@ const router = Router();
 // All routes require authentication
 router.use(authMiddleware);
 
+router.get('/:recordId/stored', HealthRecordController.getStoredAnalysis);
 router.get('/:recordId', HealthRecordController.getAnalysis);
 
 export default router;
\ No newline at end of file
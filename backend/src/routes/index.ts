@@ -2,6 +2,7 @@ import { Router } from 'express';
 import authRoutes from './auth';
 import healthRecordRoutes from './healthRecords';
 import analysisRoutes from './analysis';
+import metricsRoutes from './metrics';
 
 const router = Router();
 
@@ -18,4 +19,7 @@ router.get('/health', (req, res) => {
   });
 });
 
+// Metrics endpoints (/metrics, /metrics/slow, /metrics/reset) - admin only, see ADMIN_EMAILS
+router.use(metricsRoutes);
+
 export default router;
\ No newline at end of file
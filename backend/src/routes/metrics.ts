@@ -5,12 +5,18 @@
 import { Router } from 'express';
 import { metrics } from '../utils/Metrics';
 import { analysisCache } from '../utils/Cache';
+import { semanticCache } from '../utils/SemanticCache';
 import { analysisQueue } from '../utils/Queue';
 import { circuitBreakers } from '../utils/CircuitBreaker';
 import { rateLimiters } from '../utils/RateLimiter';
+import { slowRequests } from '../utils/Tracing';
+import { authMiddleware, requireAdmin } from '../middleware/auth';
 
 const router = Router();
 
+// Metrics expose every user's request paths and timings: operators only
+router.use('/metrics', authMiddleware, requireAdmin);
+
 // Health check endpoint
 router.get('/health', (req, res) => {
   const health = {
@@ -31,23 +37,38 @@ router.get('/metrics', (req, res) => {
   const metricsData = {
     ...metrics.getMetrics(),
     cache: analysisCache.getStats(),
+    semanticCache: semanticCache.getStats(),
     queue: analysisQueue.getStats(),
     rateLimiting: {
       aiService: {
         available: rateLimiters.aiService.getAvailableTokens()
       }
     },
+    tracing: {
+      slowThresholdMs: slowRequests.thresholdMs,
+      slowRequests: slowRequests.log.size()
+    },
     timestamp: new Date().toISOString()
   };
 
   res.json(metricsData);
 });
 
-// Reset metrics (admin only)
+// Slow request log (newest first, bounded ring buffer)
+router.get('/metrics/slow', (req, res) => {
+  res.json({
+    thresholdMs: slowRequests.thresholdMs,
+    requests: slowRequests.log.toArray()
+  });
+});
+
+// Reset metrics (admin only). The analysis queue is left alone: dropping queued
+// items would leave their callers waiting forever.
 router.post('/metrics/reset', (req, res) => {
   metrics.reset();
   analysisCache.clear();
-  analysisQueue.clear();
+  semanticCache.clear();
+  slowRequests.log.clear();
   
   res.json({ message: 'Metrics reset successfully' });
 });
@@ -44,5 +44,21 @@ CREATE TABLE health_records (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Rolling per-user history digest (refreshed on record writes, used for AI prompts)
+CREATE TABLE user_history_summaries (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    summary JSONB NOT NULL,      -- sites, symptoms, severity trajectory, episodes
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Tombstones so delta sync (?since=) can report deleted records
+CREATE TABLE health_record_deletions (
+    record_id INTEGER PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Index for faster queries
-CREATE INDEX idx_health_records_user_date ON health_records(user_id, record_date DESC);
\ No newline at end of file
+CREATE INDEX idx_health_records_user_date ON health_records(user_id, record_date DESC);
+CREATE INDEX idx_health_records_user_updated ON health_records(user_id, updated_at);
+CREATE INDEX idx_health_record_deletions_user ON health_record_deletions(user_id, deleted_at);
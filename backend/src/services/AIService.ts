@@ -1,14 +1,17 @@
 import { HealthRecord, HealthAnalysis } from '../types';
 import { rateLimiters } from '../utils/RateLimiter';
 import { analysisCache } from '../utils/Cache';
+import { semanticCache } from '../utils/SemanticCache';
 import { circuitBreakers } from '../utils/CircuitBreaker';
 import { analysisQueue, Priority } from '../utils/Queue';
 import { metrics } from '../utils/Metrics';
+import { tracer } from '../utils/Tracing';
+import { logger } from '../utils/Logger';
 
 export class AIService {
   private static readonly AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:8000';
 
-  static async analyzeHealthRecord(healthRecord: HealthRecord, userHistory?: HealthRecord[], userId?: string): Promise<HealthAnalysis> {
+  static async analyzeHealthRecord(healthRecord: HealthRecord, userHistory?: HealthRecord[], userId?: string, historySummary?: string): Promise<HealthAnalysis> {
     const startTime = Date.now();
     metrics.recordRequest();
 
@@ -26,11 +29,11 @@ export class AIService {
         metrics.recordRateLimitHit();
         metrics.recordQueuedRequest();
         // Queue the request instead of rejecting
-        return await this.queueAnalysis(healthRecord, userHistory, userId);
+        return await this.queueAnalysis(healthRecord, userHistory, userId, historySummary);
       }
       // 2. Check Cache
-      const query = this.buildQuery(healthRecord, userHistory);
-      const cached = await analysisCache.get(query);
+      const query = this.buildQuery(healthRecord, userHistory, historySummary);
+      const cached = await tracer.span('cache', () => analysisCache.get(query));
       if (cached) {
         metrics.recordCacheHit();
         metrics.recordSuccess(Date.now() - startTime);
@@ -38,27 +41,37 @@ export class AIService {
       }
       metrics.recordCacheMiss();
 
+      // 2b. Semantic near-duplicate tier (same user, same red flags)
+      const cacheScope = userId || 'anonymous';
+      const similar = await tracer.span('semantic-cache', () => semanticCache.find(healthRecord, cacheScope));
+      if (similar) {
+        metrics.recordSemanticCacheHit();
+        metrics.recordSuccess(Date.now() - startTime);
+        return { ...similar.data, recordId: healthRecord.id };
+      }
+
       // 3. Circuit Breaker + AI Call
-      const analysis = await circuitBreakers.aiService.execute(async () => {
+      const analysis = await tracer.span('circuit', () => circuitBreakers.aiService.execute(async () => {
         const result = await this.callAIService(query);
         result.recordId = healthRecord.id; // Set correct recordId
         return result;
-      });
+      }));
 
       // 4. Cache the result
       await analysisCache.set(query, analysis, 3600000); // 1 hour TTL
+      await semanticCache.set(healthRecord, cacheScope, analysis, 3600000);
 
       metrics.recordSuccess(Date.now() - startTime);
       return analysis;
 
     } catch (error) {
       metrics.recordError();
-      console.error('AI service error:', error);
+      logger.error('AI service error', { error: error instanceof Error ? error.message : String(error) });
       return this.fallbackAnalysis(healthRecord);
     }
   }
 
-  private static buildQuery(healthRecord: HealthRecord, userHistory?: HealthRecord[]): string {
+  private static buildQuery(healthRecord: HealthRecord, userHistory?: HealthRecord[], historySummary?: string): string {
     let query = `Current Symptoms Analysis:
 - Symptoms: ${healthRecord.symptoms}
 - Severity: ${healthRecord.severity}/10
@@ -68,8 +81,11 @@ export class AIService {
 - Medications: ${healthRecord.medications || 'None'}
 - Vital Signs: ${healthRecord.vital_signs || 'Not recorded'}`;
 
-      // Add historical context if available
-      if (userHistory && userHistory.length > 0) {
+      // Add historical context if available (bounded digest preferred over raw rows)
+      if (historySummary) {
+        query += `\n\n${historySummary}`;
+        query += `\n\nPlease analyze current symptoms in context of patient's health history. Identify patterns, trends, and potential underlying conditions.`;
+      } else if (userHistory && userHistory.length > 0) {
         query += `\n\nPrevious Health Records (for pattern analysis):\n`;
         userHistory.slice(0, 5).forEach((record, idx) => {
           query += `\n${idx + 1}. [${record.record_date}] ${record.symptoms} (Severity: ${record.severity}/10, Site: ${record.site})`;
@@ -86,28 +102,30 @@ export class AIService {
       const timeoutId = setTimeout(() => controller.abort(), 120000); // 2 minutes
       
       try {
-        const response = await fetch(`${this.AI_SERVICE_URL}/api/v1/analyze`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-            'X-API-Key': process.env.AI_API_KEY || 'ai-rag-demo-key-2024',
-          },
-          body: JSON.stringify({ query }),
-          signal: controller.signal
-        });
-        clearTimeout(timeoutId);
+        const aiResult = await tracer.span('llm', async () => {
+          const response = await fetch(`${this.AI_SERVICE_URL}/api/v1/analyze`, {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+              'X-API-Key': process.env.AI_API_KEY || 'ai-rag-demo-key-2024',
+            },
+            body: JSON.stringify({ query }),
+            signal: controller.signal
+          });
+          clearTimeout(timeoutId);
 
-        if (!response.ok) {
-          throw new Error(`AI service error: ${response.statusText}`);
-        }
+          if (!response.ok) {
+            throw new Error(`AI service error: ${response.statusText}`);
+          }
 
-        const aiResult = await response.json() as any;
+          return await response.json() as any;
+        });
         const analysis = aiResult.analysis || '';
 
         // Parse and return structured analysis
         // Extract recordId from query or use 0 as fallback
         const recordId = 0; // Will be set by caller
-        return this.parseAnalysis(analysis, recordId);
+        return tracer.spanSync('parse', () => this.parseAnalysis(analysis, recordId));
       } catch (fetchError) {
         clearTimeout(timeoutId);
         throw fetchError;
@@ -115,9 +133,7 @@ export class AIService {
   }
 
   private static parseAnalysis(analysis: string, recordId: number): HealthAnalysis {
-        console.log('=== AI ANALYSIS RESPONSE ===');
-        console.log(analysis);
-        console.log('=== END RESPONSE ===');
+        logger.debug('AI analysis response', { analysis });
         
         // Parse AI analysis with enhanced extraction
         const clinicalAssessment = this.extractSection(analysis, ['CLINICAL ASSESSMENT', 'ASSESSMENT', 'ANALYSIS']);
@@ -126,7 +142,7 @@ export class AIService {
         const recommendations = this.extractSection(analysis, ['RECOMMENDED', 'RECOMMENDATION', 'EVALUATION', 'NEXT STEPS', 'ACTION']);
         const redFlags = this.extractSection(analysis, ['RED FLAGS', 'WARNING', 'SAFETY', 'EMERGENCY', 'URGENT']);
         
-        console.log('Parsed sections:', { 
+        logger.debug('Parsed sections', { 
           clinicalAssessment: clinicalAssessment.length, 
           differential: differential.length,
           clinicalReasoning: clinicalReasoning.length,
@@ -148,20 +164,25 @@ export class AIService {
         };
   }
 
-  private static async queueAnalysis(healthRecord: HealthRecord, userHistory?: HealthRecord[], userId?: string): Promise<HealthAnalysis> {
+  private static async queueAnalysis(healthRecord: HealthRecord, userHistory?: HealthRecord[], userId?: string, historySummary?: string): Promise<HealthAnalysis> {
     const priority = healthRecord.severity && healthRecord.severity >= 8 ? Priority.URGENT :
                      healthRecord.severity && healthRecord.severity >= 5 ? Priority.HIGH :
                      Priority.NORMAL;
 
+    const trace = tracer.current();
+    const enqueuedAt = Date.now();
+
     return new Promise((resolve, reject) => {
       analysisQueue.add(
         healthRecord.id.toString(),
-        { healthRecord, userHistory, userId },
+        { healthRecord, userHistory, userId, historySummary, trace, enqueuedAt },
         priority
       ).then(() => {
-        // Process queue
+        // Process queue (spans go to the trace of the request that enqueued the item)
         analysisQueue.process(async (data) => {
-          const result = await this.analyzeHealthRecord(data.healthRecord, data.userHistory, data.userId);
+          data.trace?.record('queue', Date.now() - data.enqueuedAt);
+          const analyze = () => this.analyzeHealthRecord(data.healthRecord, data.userHistory, data.userId, data.historySummary);
+          const result = data.trace ? await tracer.run(data.trace, analyze) : await analyze();
           resolve(result);
         });
       }).catch(reject);
@@ -1,25 +1,52 @@
 import { HealthRecordModel } from '../models/HealthRecord';
-import { CreateHealthRecordDto, HealthRecord } from '../types';
+import { CreateHealthRecordDto, HealthRecord, RecordCollectionVersion, RecordDelta } from '../types';
 import { aiServiceClient } from './AIServiceClient';
+import { HistorySummaryService } from './HistorySummaryService';
+import { createError } from '../middleware/errorHandler';
 
 export class HealthRecordService {
   static async createRecord(userId: number, recordData: CreateHealthRecordDto): Promise<HealthRecord> {
     // Validate severity range
     if (recordData.severity && (recordData.severity < 1 || recordData.severity > 10)) {
-      throw new Error('Severity must be between 1 and 10');
+      throw createError('Severity must be between 1 and 10', 400);
     }
 
-    return await HealthRecordModel.create(userId, recordData);
+    const record = await HealthRecordModel.create(userId, recordData);
+    await HistorySummaryService.recordCreated(userId, record);
+    return record;
   }
 
   static async getUserRecords(userId: number, limit?: number): Promise<HealthRecord[]> {
     return await HealthRecordModel.findByUserId(userId, limit);
   }
 
+  static async getCollectionVersion(userId: number): Promise<RecordCollectionVersion> {
+    return await HealthRecordModel.getVersion(userId);
+  }
+
+  static async getChangesSince(userId: number, since: string): Promise<RecordDelta> {
+    const [changed, deletions] = await Promise.all([
+      HealthRecordModel.findChangedSince(userId, since),
+      HealthRecordModel.findDeletedSince(userId, since)
+    ]);
+
+    // Cursor comes from DB timestamps only (clock skew can't drop rows), at the
+    // column's microsecond precision so the newest row isn't re-sent every time.
+    // All cursors share one fixed-width format, so string order is time order.
+    const cursors = [...changed.map(r => r.sync_cursor), ...deletions.map(d => d.sync_cursor)];
+    const records = changed.map(({ sync_cursor, ...record }) => record as HealthRecord);
+
+    return {
+      records,
+      deleted: deletions.map(d => d.record_id),
+      syncedAt: cursors.length > 0 ? cursors.reduce((max, c) => (c > max ? c : max)) : since
+    };
+  }
+
   static async getRecordById(recordId: number, userId: number): Promise<HealthRecord> {
     const record = await HealthRecordModel.findById(recordId, userId);
     if (!record) {
-      throw new Error('Health record not found');
+      throw createError('Health record not found', 404);
     }
     return record;
   }
@@ -31,20 +58,21 @@ export class HealthRecordService {
   static async updateRecord(recordId: number, userId: number, recordData: CreateHealthRecordDto): Promise<HealthRecord> {
     // Validate severity range
     if (recordData.severity && (recordData.severity < 1 || recordData.severity > 10)) {
-      throw new Error('Severity must be between 1 and 10');
+      throw createError('Severity must be between 1 and 10', 400);
     }
 
     const record = await HealthRecordModel.update(recordId, userId, recordData);
     if (!record) {
-      throw new Error('Health record not found');
+      throw createError('Health record not found', 404);
     }
+    await HistorySummaryService.recordChanged(userId);
     return record;
   }
 
   static async deleteRecord(recordId: number, userId: number): Promise<void> {
     const record = await HealthRecordModel.findById(recordId, userId);
     if (!record) {
-      throw new Error('Health record not found');
+      throw createError('Health record not found', 404);
     }
 
     // Delete from PostgreSQL (source of truth)
@@ -52,6 +80,7 @@ export class HealthRecordService {
     if (!deleted) {
       throw new Error('Failed to delete health record');
     }
+    await HistorySummaryService.recordChanged(userId);
 
     // Async delete from AI service (fire-and-forget with circuit breaker)
     aiServiceClient.deleteRecordAsync(recordId);
@@ -0,0 +1,281 @@
+import { HistorySummaryModel } from '../models/HistorySummary';
+import { logger } from '../utils/Logger';
+import { HealthRecord, HistoryEpisode, HistorySummary } from '../types';
+
+/**
+ * Rolling per-user history digest.
+ * Folded incrementally on create, rebuilt on edit/delete, and rendered
+ * into a bounded-size prompt block regardless of journal length.
+ */
+export class HistorySummaryService {
+  private static readonly MAX_TERMS = 50;
+  private static readonly MAX_MONTHS = 24;
+  private static readonly MAX_EPISODES = 12;
+  private static readonly EPISODE_GAP_DAYS = 7;
+  private static readonly RECENT_TERM_DAYS = 90;
+  private static readonly MAX_WRITE_ATTEMPTS = 3;
+
+  static async getSummary(userId: number): Promise<HistorySummary> {
+    const stored = await HistorySummaryModel.findByUserId(userId);
+    return stored || await this.rebuild(userId);
+  }
+
+  static async rebuild(userId: number): Promise<HistorySummary> {
+    let summary = this.empty();
+    for (let attempt = 0; attempt < this.MAX_WRITE_ATTEMPTS; attempt++) {
+      // Read the revision before the rows so a write that lands in between is detected
+      const stored = await HistorySummaryModel.findByUserId(userId);
+      const rows = await HistorySummaryModel.findDigestRows(userId);
+      summary = rows.reduce((acc, record) => this.fold(acc, record), this.empty());
+      if (await this.save(userId, summary, stored)) break;
+    }
+    return summary;
+  }
+
+  static async recordCreated(userId: number, record: HealthRecord): Promise<void> {
+    try {
+      const stored = await HistorySummaryModel.findByUserId(userId);
+      if (!stored || !await this.save(userId, this.fold(stored, record), stored)) {
+        // No digest yet, or a concurrent create/edit won the write: recompute from the table
+        await this.rebuild(userId);
+      }
+    } catch (error) {
+      // The digest is derived data; never fail the write because of it
+      logger.error('History summary update failed', { error: error instanceof Error ? error.message : String(error) });
+    }
+  }
+
+  static async recordChanged(userId: number): Promise<void> {
+    try {
+      await this.rebuild(userId);
+    } catch (error) {
+      logger.error('History summary rebuild failed', { error: error instanceof Error ? error.message : String(error) });
+    }
+  }
+
+  /**
+   * Render the digest for a prompt. Pass the record being analyzed as `exclude`
+   * so it is not reported as its own history.
+   */
+  static toPrompt(summary: HistorySummary, exclude?: HealthRecord): string {
+    if (exclude) summary = this.without(summary, exclude);
+    if (summary.totalRecords === 0) return '';
+
+    const top = (counts: Record<string, number>, n: number) =>
+      Object.entries(counts)
+        .sort((a, b) => b[1] - a[1])
+        .slice(0, n)
+        .map(([term, count]) => `${term} (${count})`)
+        .join(', ');
+
+    const trajectory = summary.severityTrajectory
+      .slice(-6)
+      .map(p => `${p.month}: ${p.rated > 0 ? (p.severityTotal / p.rated).toFixed(1) : 'n/a'}/10 over ${p.count} records`)
+      .join('; ');
+
+    const episodes = summary.episodes
+      .slice(-5)
+      .map(e => `- ${e.key}: ${e.start} to ${e.end}, ${e.count} records, peak severity ${e.peakSeverity}/10`)
+      .join('\n');
+
+    let text = `Patient History Summary (${summary.totalRecords} records, ${summary.firstDate} to ${summary.lastDate}):`;
+    if (Object.keys(summary.sites).length > 0) text += `\n- Recurring sites: ${top(summary.sites, 5)}`;
+    if (Object.keys(summary.symptoms).length > 0) text += `\n- Recurring symptoms: ${top(summary.symptoms, 8)}`;
+    if (trajectory) text += `\n- Severity trajectory (monthly avg): ${trajectory}`;
+    if (episodes) text += `\nRecent episodes:\n${episodes}`;
+    return text;
+  }
+
+  // Write with compare-and-swap on the revision that `previous` was read at
+  private static save(userId: number, summary: HistorySummary, previous: HistorySummary | null): Promise<boolean> {
+    const revision = previous?.revision ?? 0;
+    summary.revision = revision + 1;
+    return previous
+      ? HistorySummaryModel.updateIfRevision(userId, summary, revision)
+      : HistorySummaryModel.insertIfAbsent(userId, summary);
+  }
+
+  /**
+   * Remove one record's contribution (counts, trajectory, episodes). Date range
+   * and peak severity are not reversible and are left as-is.
+   */
+  private static without(summary: HistorySummary, record: HealthRecord): HistorySummary {
+    const date = this.toDateString(record.record_date);
+    const site = record.site?.trim().toLowerCase();
+    const symptoms = this.symptomTerms(record.symptoms);
+    const severity = record.severity || 0;
+
+    const decrement = (counts: Record<string, number>, term: string) => {
+      if (!counts[term]) return;
+      if (counts[term] > 1) counts[term]--;
+      else delete counts[term];
+    };
+
+    const next: HistorySummary = {
+      ...summary,
+      totalRecords: Math.max(0, summary.totalRecords - 1),
+      sites: { ...summary.sites },
+      symptoms: { ...summary.symptoms },
+      severityTrajectory: summary.severityTrajectory.map(p => ({ ...p })),
+      episodes: summary.episodes.map(e => ({ ...e }))
+    };
+
+    if (site) decrement(next.sites, site);
+    symptoms.forEach(term => decrement(next.symptoms, term));
+
+    const point = next.severityTrajectory.find(p => p.month === date.slice(0, 7));
+    if (point) {
+      point.count--;
+      if (severity > 0) {
+        point.rated--;
+        point.severityTotal -= severity;
+      }
+    }
+    next.severityTrajectory = next.severityTrajectory.filter(p => p.count > 0);
+
+    const key = site || symptoms[0];
+    const episode = next.episodes.find(e => e.key === key && date >= e.start && date <= e.end);
+    if (episode) episode.count--;
+    next.episodes = next.episodes.filter(e => e.count > 0);
+
+    return next;
+  }
+
+  private static empty(): HistorySummary {
+    return {
+      totalRecords: 0,
+      sites: {},
+      symptoms: {},
+      siteLastSeen: {},
+      symptomLastSeen: {},
+      severityTrajectory: [],
+      episodes: [],
+      updatedAt: new Date().toISOString()
+    };
+  }
+
+  private static fold(summary: HistorySummary, record: HealthRecord): HistorySummary {
+    const date = this.toDateString(record.record_date);
+    const site = record.site?.trim().toLowerCase();
+    const symptoms = this.symptomTerms(record.symptoms);
+    const severity = record.severity || 0;
+
+    const next: HistorySummary = {
+      ...summary,
+      totalRecords: summary.totalRecords + 1,
+      firstDate: !summary.firstDate || date < summary.firstDate ? date : summary.firstDate,
+      lastDate: !summary.lastDate || date > summary.lastDate ? date : summary.lastDate,
+      sites: { ...summary.sites },
+      symptoms: { ...summary.symptoms },
+      siteLastSeen: { ...summary.siteLastSeen },
+      symptomLastSeen: { ...summary.symptomLastSeen },
+      severityTrajectory: summary.severityTrajectory.map(p => ({ ...p })),
+      episodes: summary.episodes.map(e => ({ ...e })),
+      updatedAt: new Date().toISOString()
+    };
+
+    const seen = (lastSeen: Record<string, string>, term: string) => {
+      if (!lastSeen[term] || date > lastSeen[term]) lastSeen[term] = date;
+    };
+    if (site) {
+      next.sites[site] = (next.sites[site] || 0) + 1;
+      seen(next.siteLastSeen!, site);
+    }
+    symptoms.forEach(term => {
+      next.symptoms[term] = (next.symptoms[term] || 0) + 1;
+      seen(next.symptomLastSeen!, term);
+    });
+    [next.sites, next.siteLastSeen] = this.trim(next.sites, next.siteLastSeen!, next.lastDate!);
+    [next.symptoms, next.symptomLastSeen] = this.trim(next.symptoms, next.symptomLastSeen!, next.lastDate!);
+
+    // Severity trajectory: monthly buckets
+    const month = date.slice(0, 7);
+    let point = next.severityTrajectory.find(p => p.month === month);
+    if (!point) {
+      point = { month, count: 0, rated: 0, severityTotal: 0 };
+      next.severityTrajectory.push(point);
+      next.severityTrajectory.sort((a, b) => a.month.localeCompare(b.month));
+    }
+    point.count++;
+    if (severity > 0) {
+      point.rated++;
+      point.severityTotal += severity;
+    }
+    next.severityTrajectory = next.severityTrajectory.slice(-this.MAX_MONTHS);
+
+    // Episode clusters: same site/symptom within EPISODE_GAP_DAYS
+    const key = site || symptoms[0];
+    if (key) {
+      const gap = this.EPISODE_GAP_DAYS * 86400000;
+      const time = Date.parse(date);
+      let episode = next.episodes.find(e =>
+        e.key === key && time >= Date.parse(e.start) - gap && time <= Date.parse(e.end) + gap
+      );
+      if (!episode) {
+        episode = { key, start: date, end: date, count: 0, peakSeverity: 0 };
+        next.episodes.push(episode);
+      }
+      episode.count++;
+      if (date < episode.start) episode.start = date;
+      if (date > episode.end) episode.end = date;
+      episode.peakSeverity = Math.max(episode.peakSeverity, severity);
+      next.episodes = next.episodes
+        .sort((a, b) => a.end.localeCompare(b.end))
+        .slice(-this.MAX_EPISODES);
+    }
+
+    return next;
+  }
+
+  private static symptomTerms(symptoms?: string): string[] {
+    if (!symptoms) return [];
+    return [...new Set(
+      symptoms
+        .toLowerCase()
+        .split(/[,;\n]|\band\b/)
+        .map(term => term.trim())
+        .filter(term => term.length > 2 && term.length <= 40)
+    )];
+  }
+
+  /**
+   * Keep at most MAX_TERMS terms. Up to half the slots go to terms seen within
+   * RECENT_TERM_DAYS (newest first) so a newly recurring complaint can build up
+   * a count; the rest go to the highest all-time counts.
+   */
+  private static trim(
+    counts: Record<string, number>,
+    lastSeen: Record<string, string>,
+    asOf: string
+  ): [Record<string, number>, Record<string, string>] {
+    const terms = Object.keys(counts);
+    if (terms.length <= this.MAX_TERMS) return [counts, lastSeen];
+
+    const cutoff = Date.parse(asOf) - this.RECENT_TERM_DAYS * 86400000;
+    const keep = new Set(
+      terms
+        .filter(term => lastSeen[term] && Date.parse(lastSeen[term]) >= cutoff)
+        .sort((a, b) => lastSeen[b].localeCompare(lastSeen[a]))
+        .slice(0, this.MAX_TERMS / 2)
+    );
+    terms
+      .filter(term => !keep.has(term))
+      .sort((a, b) => counts[b] - counts[a])
+      .slice(0, this.MAX_TERMS - keep.size)
+      .forEach(term => keep.add(term));
+
+    const pick = <T>(map: Record<string, T>) =>
+      Object.fromEntries(Object.entries(map).filter(([term]) => keep.has(term)));
+    return [pick(counts), pick(lastSeen)];
+  }
+
+  private static toDateString(value: string | Date): string {
+    // pg returns DATE columns as local-midnight Date objects
+    if (value instanceof Date) {
+      const month = String(value.getMonth() + 1).padStart(2, '0');
+      const day = String(value.getDate()).padStart(2, '0');
+      return `${value.getFullYear()}-${month}-${day}`;
+    }
+    return String(value).slice(0, 10);
+  }
+}
@@ -102,4 +102,48 @@ export interface HealthAnalysis {
   redFlags: string[];
   fullAnalysis?: string;
   differentialDiagnosis?: string[];
-}
\ No newline at end of file
+}
+
+export interface HistoryEpisode {
+  key: string;
+  start: string;
+  end: string;
+  count: number;
+  peakSeverity: number;
+}
+
+export interface SeverityPoint {
+  month: string;
+  count: number;
+  rated: number;
+  severityTotal: number;
+}
+
+export interface HistorySummary {
+  totalRecords: number;
+  firstDate?: string;
+  lastDate?: string;
+  sites: Record<string, number>;
+  symptoms: Record<string, number>;
+  // Latest record_date per term; recent terms survive trimming
+  siteLastSeen?: Record<string, string>;
+  symptomLastSeen?: Record<string, string>;
+  severityTrajectory: SeverityPoint[];
+  episodes: HistoryEpisode[];
+  // Incremented on every write; concurrent writers compare-and-swap on it
+  revision?: number;
+  updatedAt: string;
+}
+
+
+export interface RecordCollectionVersion {
+  count: number;
+  last_updated: Date | null;
+  id_sum: string | number;
+}
+
+export interface RecordDelta {
+  records: HealthRecord[];
+  deleted: number[];
+  syncedAt: string;
+}
@@ -0,0 +1,49 @@
+/**
+ * HTTP Conditional Requests (Industry Standard)
+ * Strong ETags from row versions + If-None-Match -> 304
+ * Used by: GitHub API, Stripe, CDNs (RFC 9110)
+ */
+
+import crypto from 'crypto';
+import { Request, Response } from 'express';
+
+type VersionPart = string | number | Date | null | undefined;
+
+// Compressed representations get an encoding suffix inside the quotes ("abc-br")
+const ENCODING_SUFFIX = /-(br|gzip)$/;
+
+const normalize = (part: VersionPart): string => {
+  if (part instanceof Date) return part.getTime().toString();
+  if (part === null || part === undefined) return '';
+  return String(part);
+};
+
+export const strongETag = (...parts: VersionPart[]): string => {
+  const hash = crypto.createHash('sha1').update(parts.map(normalize).join(':')).digest('base64url');
+  return `"${hash}"`;
+};
+
+const opaqueTag = (tag: string): string =>
+  tag.trim().replace(/^W\//, '').replace(/^"|"$/g, '').replace(ENCODING_SUFFIX, '');
+
+export const matchesIfNoneMatch = (header: string | undefined, etag: string): boolean => {
+  if (!header) return false;
+  if (header.trim() === '*') return true;
+  const target = opaqueTag(etag);
+  return header.split(',').some(tag => opaqueTag(tag) === target);
+};
+
+/**
+ * Sets validators on the response and answers 304 when the client copy is current.
+ * Returns true when the response has been sent.
+ */
+export const notModified = (req: Request, res: Response, etag: string): boolean => {
+  res.setHeader('ETag', etag);
+  res.setHeader('Cache-Control', 'private, no-cache');
+
+  if (matchesIfNoneMatch(req.header('If-None-Match'), etag)) {
+    res.status(304).end();
+    return true;
+  }
+  return false;
+};
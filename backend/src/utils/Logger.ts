@@ -0,0 +1,93 @@
+/**
+ * Structured Logging (Industry Standard)
+ * JSON lines, buffered and flushed off the hot path, with sampling
+ * Used by: Pino, Bunyan, Datadog
+ */
+
+type LogLevel = 'debug' | 'info' | 'warn' | 'error';
+
+const LEVELS: Record<LogLevel, number> = { debug: 10, info: 20, warn: 30, error: 40 };
+
+interface LoggerConfig {
+  level: LogLevel;
+  sampleRate: number;   // fraction of sampled (per-request) logs kept, 0-1
+  maxBuffer: number;    // lines buffered before a forced flush
+}
+
+export class StructuredLogger {
+  private buffer: string[] = [];
+  private flushScheduled = false;
+  private readonly config: LoggerConfig;
+
+  constructor(config: Partial<LoggerConfig> = {}) {
+    this.config = {
+      level: 'info',
+      sampleRate: 1,
+      maxBuffer: 100,
+      ...config
+    };
+    // Unknown levels would compare against NaN and silently disable filtering
+    if (!Object.prototype.hasOwnProperty.call(LEVELS, this.config.level)) {
+      this.config.level = 'info';
+    }
+    // A NaN rate would never sample, dropping every ordinary request log
+    if (!(this.config.sampleRate >= 0 && this.config.sampleRate <= 1)) {
+      this.config.sampleRate = 1;
+    }
+  }
+
+  shouldSample(): boolean {
+    return this.config.sampleRate >= 1 || Math.random() < this.config.sampleRate;
+  }
+
+  log(level: LogLevel, message: string, fields: Record<string, any> = {}): void {
+    if (LEVELS[level] < LEVELS[this.config.level]) return;
+
+    this.buffer.push(JSON.stringify({
+      timestamp: new Date().toISOString(),
+      level,
+      message,
+      ...fields
+    }));
+
+    if (this.buffer.length >= this.config.maxBuffer) {
+      this.flush();
+    } else if (!this.flushScheduled) {
+      this.flushScheduled = true;
+      setImmediate(() => this.flush());
+    }
+  }
+
+  debug(message: string, fields?: Record<string, any>): void {
+    this.log('debug', message, fields);
+  }
+
+  info(message: string, fields?: Record<string, any>): void {
+    this.log('info', message, fields);
+  }
+
+  warn(message: string, fields?: Record<string, any>): void {
+    this.log('warn', message, fields);
+  }
+
+  error(message: string, fields?: Record<string, any>): void {
+    this.log('error', message, fields);
+  }
+
+  flush(): void {
+    this.flushScheduled = false;
+    if (this.buffer.length === 0) return;
+
+    const lines = this.buffer.join('\n') + '\n';
+    this.buffer = [];
+    process.stdout.write(lines);
+  }
+}
+
+// Global logger instance
+export const logger = new StructuredLogger({
+  level: (process.env.LOG_LEVEL || 'info').toLowerCase() as LogLevel,
+  sampleRate: parseFloat(process.env.LOG_SAMPLE_RATE || '1')
+});
+
+process.on('exit', () => logger.flush());
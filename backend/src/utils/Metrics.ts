@@ -72,6 +72,7 @@ export class Metrics {
   private durationHistogram = new Histogram();
   private cacheHitCounter = new Counter();
   private cacheMissCounter = new Counter();
+  private semanticCacheHitCounter = new Counter();
 
   // Rate limiting metrics
   private rateLimitHitCounter = new Counter();
@@ -98,6 +99,10 @@ export class Metrics {
     this.cacheMissCounter.inc();
   }
 
+  recordSemanticCacheHit(): void {
+    this.semanticCacheHitCounter.inc();
+  }
+
   recordRateLimitHit(): void {
     this.rateLimitHitCounter.inc();
   }
@@ -134,7 +139,8 @@ export class Metrics {
       cache: {
         hits: this.cacheHitCounter.get(),
         misses: this.cacheMissCounter.get(),
-        hitRate: cacheTotal > 0 ? (this.cacheHitCounter.get() / cacheTotal) * 100 : 0
+        hitRate: cacheTotal > 0 ? (this.cacheHitCounter.get() / cacheTotal) * 100 : 0,
+        semanticHits: this.semanticCacheHitCounter.get()
       },
 
       // Rate Limiting
@@ -151,6 +157,7 @@ export class Metrics {
     this.errorCounter.reset();
     this.cacheHitCounter.reset();
     this.cacheMissCounter.reset();
+    this.semanticCacheHitCounter.reset();
     this.rateLimitHitCounter.reset();
     this.queuedRequestCounter.reset();
   }
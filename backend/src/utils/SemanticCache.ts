@@ -0,0 +1,354 @@
+/**
+ * Semantic Near-Duplicate Cache (Industry Standard)
+ * Hashed TF-IDF vectors + cosine similarity, computed locally (no network)
+ * Used by: GPTCache, LangChain semantic caches
+ */
+
+import crypto from 'crypto';
+import { HealthRecord } from '../types';
+
+type SparseVector = Map<number, number>;
+
+interface SemanticCacheConfig {
+  enabled: boolean;
+  threshold: number;     // minimum cosine similarity for a hit (0-1)
+  maxEntries: number;
+  dimensions: number;    // hashing trick bucket count
+  maxSeverityDelta: number;
+  ttl: number;
+}
+
+interface SemanticEntry<T> {
+  scope: string;
+  redFlagKey: string;
+  severity: number;
+  termCounts: SparseVector;
+  data: T;
+  expires: number;
+  lastAccess: number;
+  hits: number;
+}
+
+export interface SemanticMatch<T> {
+  data: T;
+  similarity: number;
+}
+
+// Free-text SOCRATES/PQRST fields that describe the complaint itself
+const TEXT_FIELDS: (keyof HealthRecord)[] = [
+  'symptoms', 'site', 'region', 'onset', 'character', 'quality', 'radiation',
+  'associations', 'time_course', 'exacerbating_factors', 'palliating_factors', 'medications'
+];
+
+// Terms that must never be answered from another record's analysis. Matched on
+// whole words across every text field, so "shortness of breath" typed into
+// associations counts the same as in symptoms.
+const RED_FLAG_TERMS: [string, RegExp][] = [
+  ['chest-pain', /\bchest (pain|tightness|pressure|heaviness)\b/],
+  ['breathing', /\b(shortness of breath|short of breath|breathless\w*|can'?t breathe|difficulty breathing|trouble breathing|breathing)\b/],
+  ['syncope', /\b(faint\w*|passed out|black(ed)? out|syncope|unconscious|collapse\w*)\b/],
+  ['neuro-deficit', /\b(numbness|numb|paralys\w+|slurred speech|facial droop|weakness on one side|one[- ]sided weakness|confus\w+|vision loss|loss of vision)\b/],
+  ['seizure', /\b(seizure\w*|convulsion\w*|fit)\b/],
+  ['headache-severe', /\b(worst headache|thunderclap|sudden severe headache|stiff neck)\b/],
+  ['bleeding', /\b(vomit\w* blood|cough\w* (up )?blood|blood in (stool|urine|vomit)|black stool\w*|tarry stool\w*|haemorrhag\w*|hemorrhag\w*|heavy bleeding|bleeding heavily)\b/],
+  ['anaphylaxis', /\b(anaphyla\w*|throat (swelling|closing)|swollen (tongue|throat|lips)|tongue swelling|lip swelling)\b/],
+  ['cyanosis', /\b(blue lips|cyanos\w*|turning blue)\b/],
+  ['palpitations', /\b(palpitation\w*|racing heart|heart racing|irregular heartbeat)\b/],
+  ['self-harm', /\b(suicid\w*|self[- ]harm\w*|kill myself|overdos\w*)\b/]
+];
+
+const STOP_WORDS = new Set([
+  'a', 'an', 'and', 'the', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'my', 'i', 'is',
+  'it', 'was', 'am', 'are', 'be', 'been', 'very', 'some', 'bit', 'feel', 'feels', 'feeling',
+  'severity', 'none', 'recorded', 'out'
+]);
+
+export class HashedTfIdfVectorizer {
+  private documentFrequency = new Map<number, number>();
+  private documentCount = 0;
+
+  constructor(private readonly dimensions: number = 4096) {}
+
+  /**
+   * Normalize free text into comparable tokens: lowercase, strip punctuation
+   * and numbers ("7/10" is carried by severity), drop stop words, light stemming.
+   */
+  tokenize(text: string): string[] {
+    return text
+      .toLowerCase()
+      .replace(/[^a-z\s]/g, ' ')
+      .split(/\s+/)
+      .filter(token => token.length > 1 && !STOP_WORDS.has(token))
+      .map(token => this.stem(token));
+  }
+
+  private stem(token: string): string {
+    if (token.length > 5 && token.endsWith('ing')) return token.slice(0, -3);
+    if (token.length > 4 && token.endsWith('es')) return token.slice(0, -2);
+    if (token.length > 3 && token.endsWith('s') && !token.endsWith('ss')) return token.slice(0, -1);
+    return token;
+  }
+
+  private bucket(token: string): number {
+    return crypto.createHash('md5').update(token).digest().readUInt32BE(0) % this.dimensions;
+  }
+
+  termCounts(text: string): SparseVector {
+    const counts: SparseVector = new Map();
+    for (const token of this.tokenize(text)) {
+      const index = this.bucket(token);
+      counts.set(index, (counts.get(index) || 0) + 1);
+    }
+    return counts;
+  }
+
+  addDocument(counts: SparseVector): void {
+    this.documentCount++;
+    for (const index of counts.keys()) {
+      this.documentFrequency.set(index, (this.documentFrequency.get(index) || 0) + 1);
+    }
+  }
+
+  removeDocument(counts: SparseVector): void {
+    this.documentCount = Math.max(0, this.documentCount - 1);
+    for (const index of counts.keys()) {
+      const df = (this.documentFrequency.get(index) || 0) - 1;
+      if (df > 0) this.documentFrequency.set(index, df);
+      else this.documentFrequency.delete(index);
+    }
+  }
+
+  /**
+   * Sublinear TF * smoothed IDF, L2-normalized so a dot product is cosine similarity
+   */
+  weigh(counts: SparseVector): SparseVector {
+    const vector: SparseVector = new Map();
+    let norm = 0;
+
+    for (const [index, count] of counts.entries()) {
+      const df = this.documentFrequency.get(index) || 0;
+      const idf = Math.log((1 + this.documentCount) / (1 + df)) + 1;
+      const weight = (1 + Math.log(count)) * idf;
+      vector.set(index, weight);
+      norm += weight * weight;
+    }
+
+    norm = Math.sqrt(norm);
+    if (norm > 0) {
+      for (const [index, weight] of vector.entries()) {
+        vector.set(index, weight / norm);
+      }
+    }
+    return vector;
+  }
+
+  static cosine(a: SparseVector, b: SparseVector): number {
+    const [small, large] = a.size <= b.size ? [a, b] : [b, a];
+    let dot = 0;
+    for (const [index, weight] of small.entries()) {
+      const other = large.get(index);
+      if (other !== undefined) dot += weight * other;
+    }
+    return dot;
+  }
+
+  reset(): void {
+    this.documentFrequency.clear();
+    this.documentCount = 0;
+  }
+}
+
+export class SemanticAnalysisCache<T = any> {
+  private entries: SemanticEntry<T>[] = [];
+  private readonly vectorizer: HashedTfIdfVectorizer;
+  private readonly config: SemanticCacheConfig;
+  private hits = 0;
+  private misses = 0;
+
+  constructor(config: Partial<SemanticCacheConfig> = {}) {
+    this.config = {
+      enabled: false,
+      threshold: 0.85,
+      maxEntries: 500,
+      dimensions: 4096,
+      maxSeverityDelta: 1,
+      ttl: 3600000,
+      ...config
+    };
+    // A NaN threshold would turn every comparison into a hit
+    if (!(this.config.threshold > 0 && this.config.threshold <= 1)) {
+      this.config.threshold = 0.85;
+    }
+    this.vectorizer = new HashedTfIdfVectorizer(this.config.dimensions);
+  }
+
+  isEnabled(): boolean {
+    return this.config.enabled;
+  }
+
+  /**
+   * Canonical red-flag set for a record, from every text field (free notes
+   * included), abnormal vital signs and top-of-scale severity. Two records are
+   * only comparable when these sets are identical.
+   */
+  static redFlagKey(record: HealthRecord): string {
+    const text = [...TEXT_FIELDS, 'personal_notes' as keyof HealthRecord]
+      .map(field => record[field])
+      .filter(value => typeof value === 'string')
+      .join(' \n ')
+      .toLowerCase()
+      .replace(/\s+/g, ' ');
+
+    const flags = RED_FLAG_TERMS
+      .filter(([, pattern]) => pattern.test(text))
+      .map(([flag]) => flag);
+
+    if ((record.severity || 0) >= 9) flags.push('severity-9+');
+
+    const vitals = record.vital_signs || {};
+    const bp = (vitals.blood_pressure || '').match(/(\d{2,3})\s*\/\s*(\d{2,3})/);
+    if (bp) {
+      const systolic = parseInt(bp[1], 10);
+      const diastolic = parseInt(bp[2], 10);
+      if (systolic >= 180 || diastolic >= 120) flags.push('bp-high');
+      if (systolic < 90) flags.push('bp-low');
+    }
+    const temperature = parseFloat(vitals.temperature || '');
+    if (!isNaN(temperature)) {
+      // Values above 50 are taken as Fahrenheit
+      const celsius = temperature > 50 ? (temperature - 32) * 5 / 9 : temperature;
+      if (celsius >= 39.5) flags.push('fever-high');
+      if (celsius < 35) flags.push('hypothermia');
+    }
+    const pulse = parseInt(vitals.pulse || '', 10);
+    if (!isNaN(pulse)) {
+      if (pulse >= 120) flags.push('pulse-high');
+      if (pulse < 45) flags.push('pulse-low');
+    }
+
+    return flags.sort().join('|');
+  }
+
+  /**
+   * Normalized SOCRATES text for a record (history and free notes excluded)
+   */
+  static recordText(record: HealthRecord): string {
+    return TEXT_FIELDS
+      .map(field => record[field])
+      .filter(value => typeof value === 'string' && value.trim().length > 0)
+      .join(' ');
+  }
+
+  private isExpired(entry: SemanticEntry<T>): boolean {
+    return Date.now() > entry.expires;
+  }
+
+  private remove(index: number): void {
+    const [entry] = this.entries.splice(index, 1);
+    this.vectorizer.removeDocument(entry.termCounts);
+  }
+
+  private evict(): void {
+    for (let i = this.entries.length - 1; i >= 0; i--) {
+      if (this.isExpired(this.entries[i])) this.remove(i);
+    }
+    if (this.entries.length < this.config.maxEntries) return;
+
+    // LRU eviction: remove least recently accessed
+    let oldest = 0;
+    for (let i = 1; i < this.entries.length; i++) {
+      if (this.entries[i].lastAccess < this.entries[oldest].lastAccess) oldest = i;
+    }
+    this.remove(oldest);
+  }
+
+  /**
+   * Nearest cached analysis for a record. Safety rules: never crosses users,
+   * never crosses a red-flag difference (see redFlagKey), and severity must be
+   * within maxSeverityDelta.
+   */
+  async find(record: HealthRecord, scope: string): Promise<SemanticMatch<T> | null> {
+    if (!this.config.enabled) return null;
+
+    const counts = this.vectorizer.termCounts(SemanticAnalysisCache.recordText(record));
+    if (counts.size === 0) return null;
+
+    const query = this.vectorizer.weigh(counts);
+    const redFlagKey = SemanticAnalysisCache.redFlagKey(record);
+    const severity = record.severity || 0;
+
+    let best: SemanticEntry<T> | null = null;
+    let bestSimilarity = 0;
+
+    for (let i = this.entries.length - 1; i >= 0; i--) {
+      const entry = this.entries[i];
+      if (this.isExpired(entry)) {
+        this.remove(i);
+        continue;
+      }
+      if (entry.scope !== scope || entry.redFlagKey !== redFlagKey) continue;
+      if (Math.abs(entry.severity - severity) > this.config.maxSeverityDelta) continue;
+
+      const similarity = HashedTfIdfVectorizer.cosine(query, this.vectorizer.weigh(entry.termCounts));
+      if (similarity > bestSimilarity) {
+        bestSimilarity = similarity;
+        best = entry;
+      }
+    }
+
+    if (!best || bestSimilarity < this.config.threshold) {
+      this.misses++;
+      return null;
+    }
+
+    this.hits++;
+    best.hits++;
+    best.lastAccess = Date.now();
+    return { data: best.data, similarity: bestSimilarity };
+  }
+
+  async set(record: HealthRecord, scope: string, data: T, ttl: number = this.config.ttl): Promise<void> {
+    if (!this.config.enabled) return;
+
+    const termCounts = this.vectorizer.termCounts(SemanticAnalysisCache.recordText(record));
+    if (termCounts.size === 0) return;
+
+    this.evict();
+    this.vectorizer.addDocument(termCounts);
+    this.entries.push({
+      scope,
+      redFlagKey: SemanticAnalysisCache.redFlagKey(record),
+      severity: record.severity || 0,
+      termCounts,
+      data,
+      expires: Date.now() + ttl,
+      lastAccess: Date.now(),
+      hits: 0
+    });
+  }
+
+  async clear(): Promise<void> {
+    this.entries = [];
+    this.vectorizer.reset();
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  getStats() {
+    const lookups = this.hits + this.misses;
+    return {
+      enabled: this.config.enabled,
+      threshold: this.config.threshold,
+      size: this.entries.length,
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups > 0 ? (this.hits / lookups) * 100 : 0
+    };
+  }
+}
+
+// Global semantic cache instance (opt-in via SEMANTIC_CACHE_ENABLED=true)
+export const semanticCache = new SemanticAnalysisCache({
+  enabled: process.env.SEMANTIC_CACHE_ENABLED === 'true',
+  threshold: parseFloat(process.env.SEMANTIC_CACHE_THRESHOLD || '0.85')
+});
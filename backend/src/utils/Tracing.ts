@@ -0,0 +1,136 @@
+/**
+ * Request-Level Tracing (Industry Standard)
+ * Per-request spans via AsyncLocalStorage, emitted as Server-Timing headers
+ * Used by: OpenTelemetry, Chrome DevTools, Cloudflare
+ */
+
+import { AsyncLocalStorage } from 'async_hooks';
+
+interface SpanData {
+  duration: number;
+  count: number;
+}
+
+export interface SlowRequest {
+  timestamp: string;
+  method: string;
+  route: string;
+  path: string;
+  status: number;
+  duration: number;
+  spans: Record<string, number>;
+}
+
+export class Trace {
+  readonly start = process.hrtime.bigint();
+  private spans = new Map<string, SpanData>();
+
+  record(name: string, duration: number): void {
+    const span = this.spans.get(name) || { duration: 0, count: 0 };
+    span.duration += duration;
+    span.count++;
+    this.spans.set(name, span);
+  }
+
+  elapsed(): number {
+    return Number(process.hrtime.bigint() - this.start) / 1e6;
+  }
+
+  getSpans(): Record<string, number> {
+    const result: Record<string, number> = {};
+    for (const [name, span] of this.spans.entries()) {
+      result[name] = Math.round(span.duration * 10) / 10;
+    }
+    return result;
+  }
+
+  /**
+   * Server-Timing header value, e.g. `db;dur=12.3;desc="2x", total;dur=40.1`
+   */
+  toServerTiming(): string {
+    const entries = [...this.spans.entries()].map(([name, span]) => {
+      const desc = span.count > 1 ? `;desc="${span.count}x"` : '';
+      return `${name};dur=${span.duration.toFixed(1)}${desc}`;
+    });
+    entries.push(`total;dur=${this.elapsed().toFixed(1)}`);
+    return entries.join(', ');
+  }
+}
+
+export class RingBuffer<T> {
+  private items: T[] = [];
+  private next = 0;
+
+  constructor(private readonly capacity: number) {}
+
+  push(item: T): void {
+    if (this.items.length < this.capacity) {
+      this.items.push(item);
+    } else {
+      this.items[this.next] = item;
+    }
+    this.next = (this.next + 1) % this.capacity;
+  }
+
+  // Newest first
+  toArray(): T[] {
+    if (this.items.length < this.capacity) return [...this.items].reverse();
+    return [...this.items.slice(this.next), ...this.items.slice(0, this.next)].reverse();
+  }
+
+  size(): number {
+    return this.items.length;
+  }
+
+  clear(): void {
+    this.items = [];
+    this.next = 0;
+  }
+}
+
+export class Tracer {
+  private storage = new AsyncLocalStorage<Trace>();
+
+  run<T>(trace: Trace, fn: () => T): T {
+    return this.storage.run(trace, fn);
+  }
+
+  current(): Trace | undefined {
+    return this.storage.getStore();
+  }
+
+  /**
+   * Time an async operation as a named span on the active request trace.
+   * No-op outside a request (scripts, background jobs).
+   */
+  async span<T>(name: string, fn: () => Promise<T>): Promise<T> {
+    const trace = this.current();
+    if (!trace) return fn();
+
+    const start = process.hrtime.bigint();
+    try {
+      return await fn();
+    } finally {
+      trace.record(name, Number(process.hrtime.bigint() - start) / 1e6);
+    }
+  }
+
+  spanSync<T>(name: string, fn: () => T): T {
+    const trace = this.current();
+    if (!trace) return fn();
+
+    const start = process.hrtime.bigint();
+    try {
+      return fn();
+    } finally {
+      trace.record(name, Number(process.hrtime.bigint() - start) / 1e6);
+    }
+  }
+}
+
+// Global tracer and slow request log
+export const tracer = new Tracer();
+export const slowRequests = {
+  thresholdMs: parseInt(process.env.SLOW_REQUEST_MS || '1000'),
+  log: new RingBuffer<SlowRequest>(parseInt(process.env.SLOW_REQUEST_BUFFER || '100'))
+};
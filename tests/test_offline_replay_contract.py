@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Offline Replay Contract Test
+The web client replays its offline outbox and decides per response whether to
+keep, retry or drop a queued write. These are the statuses it relies on:
+  - expired / invalid JWT  -> 401 (outbox kept)
+  - record deleted elsewhere -> 404 (entry dropped)
+  - validation failure     -> 400 (entry dropped)
+
+Requires a running backend (skipped otherwise):
+  cd backend && npm run dev
+  JWT_SECRET=<backend secret> python -m pytest tests/test_offline_replay_contract.py
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+
+import pytest
+import requests
+
+BACKEND_URL = "http://localhost:3001/api"
+JWT_SECRET = os.environ.get("JWT_SECRET", "your-secret-key")
+
+
+def backend_available():
+    try:
+        return requests.get(f"{BACKEND_URL}/health", timeout=2).ok
+    except requests.exceptions.RequestException:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not backend_available(), reason="backend not running on :3001")
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def sign_token(payload):
+    """HS256 JWT, same format as AuthService.generateToken"""
+    header = b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    body = b64url(json.dumps(payload).encode())
+    signature = hmac.new(JWT_SECRET.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{b64url(signature)}"
+
+
+RECORD = {
+    "record_date": "2026-01-15",
+    "record_time": "08:30",
+    "symptoms": "Headache",
+    "site": "Head",
+    "severity": 4,
+}
+
+
+@pytest.fixture(scope="module")
+def session():
+    email = f"replay_contract_{int(time.time())}@test.com"
+    r = requests.post(f"{BACKEND_URL}/auth/register", json={"email": email, "password": "Replay123!"}, timeout=10)
+    r.raise_for_status()
+    data = r.json()["data"]
+    headers = {"Authorization": f"Bearer {data['token']}"}
+
+    r = requests.post(f"{BACKEND_URL}/health-records", json=RECORD, headers=headers, timeout=10)
+    r.raise_for_status()
+    return {"user": data["user"], "headers": headers, "record_id": r.json()["data"]["id"]}
+
+
+def test_expired_token_replay_is_unauthorized(session):
+    user = session["user"]
+    now = int(time.time())
+    token = sign_token({"id": user["id"], "email": user["email"], "iat": now - 2 * 86400, "exp": now - 86400})
+
+    r = requests.put(f"{BACKEND_URL}/health-records/{session['record_id']}",
+                     json={**RECORD, "severity": 5}, headers={"Authorization": f"Bearer {token}"}, timeout=10)
+
+    # 400 would make the client treat the queued edit as rejected and discard it
+    assert r.status_code == 401
+
+
+def test_invalid_token_is_unauthorized(session):
+    r = requests.post(f"{BACKEND_URL}/health-records", json=RECORD,
+                      headers={"Authorization": "Bearer not-a-jwt"}, timeout=10)
+    assert r.status_code == 401
+
+
+def test_replayed_edit_of_deleted_record_is_not_found(session):
+    headers = session["headers"]
+    r = requests.post(f"{BACKEND_URL}/health-records", json=RECORD, headers=headers, timeout=10)
+    record_id = r.json()["data"]["id"]
+    requests.delete(f"{BACKEND_URL}/health-records/{record_id}", headers=headers, timeout=10).raise_for_status()
+
+    r = requests.put(f"{BACKEND_URL}/health-records/{record_id}", json=RECORD, headers=headers, timeout=10)
+    assert r.status_code == 404
+
+    r = requests.get(f"{BACKEND_URL}/health-records/{record_id}", headers=headers, timeout=10)
+    assert r.status_code == 404
+
+
+def test_replayed_invalid_edit_is_rejected(session):
+    r = requests.put(f"{BACKEND_URL}/health-records/{session['record_id']}",
+                     json={**RECORD, "severity": 11}, headers=session["headers"], timeout=10)
+    assert r.status_code == 400
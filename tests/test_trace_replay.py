@@ -0,0 +1,141 @@
+"""
+Unit tests for the pure helpers in trace_replay.py (no backend needed)
+  python -m pytest tests/test_trace_replay.py
+"""
+import json
+import re
+from datetime import date
+
+import pytest
+
+import trace_replay as tr
+
+
+# ==================== percentile ====================
+
+@pytest.mark.parametrize("values, p, expected", [
+    (list(range(1, 11)), 50, 5),
+    (list(range(1, 11)), 90, 9),
+    (list(range(1, 11)), 100, 10),
+    (list(range(1, 101)), 99, 99),
+    (list(range(1, 1001)), 99.9, 999),
+    ([1, 2], 50, 1),
+    ([7], 99, 7),
+])
+def test_percentile_nearest_rank(values, p, expected):
+    assert tr.percentile(values, p) == expected
+
+
+def test_percentile_ignores_input_order_and_empty():
+    assert tr.percentile([30, 10, 20], 50) == 20
+    assert tr.percentile([], 99) == 0.0
+
+
+# ==================== peak_concurrency ====================
+
+def test_peak_concurrency_overlapping():
+    assert tr.peak_concurrency([(0, 10), (1, 5), (2, 3), (6, 7)]) == 3
+
+
+def test_peak_concurrency_back_to_back_does_not_overlap():
+    assert tr.peak_concurrency([(0, 1), (1, 2), (2, 3)]) == 1
+
+
+def test_peak_concurrency_empty():
+    assert tr.peak_concurrency([]) == 0
+
+
+# ==================== normalize_route ====================
+
+@pytest.mark.parametrize("route, expected", [
+    ("/api/health-records/", "/api/health-records"),
+    ("/api/health-records", "/api/health-records"),
+    ("/api/health-records/:id", "/api/health-records/:id"),
+    ("/", "/"),
+])
+def test_normalize_route(route, expected):
+    assert tr.normalize_route(route) == expected
+
+
+# ==================== synthesize ====================
+
+def test_synthesize_keeps_validated_fields_well_formed():
+    body = tr.synthesize({
+        "record_date": "string",
+        "record_time": "string",
+        "severity": "number",
+        "symptoms": "string",
+        "vital_signs": {"pulse": "string"},
+        "tags": "array",
+        "notes": "null",
+    })
+    assert body["record_date"] == date.today().isoformat()
+    assert re.fullmatch(r"\d{2}:\d{2}", body["record_time"])
+    assert 1 <= body["severity"] <= 10
+    assert isinstance(body["symptoms"], str)
+    assert isinstance(body["vital_signs"]["pulse"], str)
+    assert body["tags"] == []
+    assert body["notes"] is None
+
+
+def test_synthesize_auth_fields():
+    body = tr.synthesize({"email": "string", "password": "string"})
+    assert body["email"].endswith("@test.com")
+    assert body["password"]
+
+
+# ==================== record_trace round-trip ====================
+
+def log_line(timestamp, method, route, duration, **fields):
+    return json.dumps({
+        "level": "info", "message": "request", "timestamp": timestamp,
+        "method": method, "route": route, "path": route, "status": 200, "duration": duration, **fields,
+    })
+
+
+@pytest.fixture
+def request_log(tmp_path):
+    lines = [
+        "🚀 Server running on port 3001",
+        "{not json",
+        json.dumps({"level": "info", "message": "other event", "timestamp": "2026-10-19T10:00:00.000Z"}),
+        # Written on finish, so out of arrival order: arrivals are 10:00:00.400 and 10:00:00.250
+        log_line("2026-10-19T10:00:00.500Z", "GET", "/api/health-records/", 100, query=["since"]),
+        log_line("2026-10-19T10:00:00.300Z", "POST", "/api/health-records/", 50,
+                 bodyShape={"record_date": "string", "severity": "number"}),
+        log_line("2026-10-19T10:00:00.900Z", "GET", "/api/metrics", 1),
+        log_line("2026-10-19T10:00:00.950Z", "OPTIONS", "/api/health-records/", 1),
+        log_line("2026-10-19T10:00:01.000Z", "GET", "/api/health-records/:id", 200),
+    ]
+    path = tmp_path / "backend.log"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_record_trace_round_trip(request_log, tmp_path):
+    output = tmp_path / "out.trace.gz"
+    assert tr.record_trace(str(request_log), str(output)) == 3
+
+    header, events = tr.load_trace(str(output))
+    assert header["version"] == tr.TRACE_VERSION
+    assert header["requests"] == 3
+    # POST 0.250-0.300, GET 0.400-0.500, GET :id 0.800-1.000: never overlapping
+    assert header["peakConcurrency"] == 1
+
+    assert [(e["m"], e["r"]) for e in events] == [
+        ("POST", "/api/health-records"),
+        ("GET", "/api/health-records"),
+        ("GET", "/api/health-records/:id"),
+    ]
+    assert [e["dt"] for e in events] == [0.0, 150.0, 400.0]
+    assert events[0]["b"] == {"record_date": "string", "severity": "number"}
+    assert events[1]["q"] == ["since"]
+    assert "q" not in events[2] and "b" not in events[2]
+
+
+def test_auto_workers_scales_with_speed():
+    header = {"peakConcurrency": 40}
+    assert tr.auto_workers(header, [], 1.0) == 80
+    assert tr.auto_workers(header, [], 10.0) == 800
+    assert tr.auto_workers(header, [{}] * 5000, None) == tr.MAX_AUTO_WORKERS
+    assert tr.auto_workers({}, [], 1.0) == 16
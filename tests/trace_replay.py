@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Trace-Driven Load Replay
+Records request traces from the backend's structured request log and replays
+them against a target with open-loop arrivals.
+
+  record: backend log (JSON lines)  ->  compact trace file (.trace.gz)
+  replay: trace file  ->  target backend at 1x, 10x, ... or max speed
+
+Latency is reported twice:
+  - service time:  measured from when the request was actually sent
+  - response time: measured from when the trace says it *should* have been sent
+                   (corrected for coordinated omission - a stalled server cannot
+                   hide its backlog by slowing down the load generator)
+
+Usage:
+  LOG_SAMPLE_RATE=1 npm run dev > backend.log
+  python tests/trace_replay.py record backend.log -o evening.trace.gz
+  python tests/trace_replay.py replay evening.trace.gz --speed 10
+  python tests/trace_replay.py replay evening.trace.gz --speed max --json
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date
+
+import requests
+
+BACKEND_URL = "http://localhost:3001"
+TRACE_VERSION = 1
+
+# Routes that are not user traffic
+IGNORED_ROUTES = {"/api/metrics", "/api/metrics/slow", "/api/metrics/reset"}
+
+# p99 send lag above which the replay no longer reproduces the recorded arrival rate
+LAG_WARNING_MS = 50
+
+# Ceiling for automatically sized worker pools
+MAX_AUTO_WORKERS = 1024
+
+# ==================== RECORD ====================
+
+def normalize_route(route):
+    """Router-level routes log as '/api/health-records/'; strip the trailing slash"""
+    return route.rstrip("/") or "/"
+
+
+def peak_concurrency(intervals):
+    """Most requests in flight at once, from (start, end) pairs"""
+    edges = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    peak = current = 0
+    for _, delta in edges:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def parse_timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def read_request_log(path):
+    """Yield request entries from a backend log, skipping non-JSON console output"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("{"):
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("message") != "request" or "route" not in entry:
+                continue
+            yield entry
+
+
+def record_trace(log_path, output_path):
+    """Convert a request log into a compact trace of inter-arrival times"""
+    events = []
+    for entry in read_request_log(log_path):
+        entry["route"] = normalize_route(entry["route"])
+        if entry["route"] in IGNORED_ROUTES or entry["method"] == "OPTIONS":
+            continue
+        # Log lines are written on finish; arrival = finish - duration
+        arrival = parse_timestamp(entry["timestamp"]) - entry.get("duration", 0) / 1000.0
+        events.append((arrival, entry))
+
+    events.sort(key=lambda e: e[0])
+    peak = peak_concurrency([(arrival, arrival + entry.get("duration", 0) / 1000.0) for arrival, entry in events])
+
+    with gzip.open(output_path, "wt", encoding="utf-8") as f:
+        header = {"version": TRACE_VERSION, "source": log_path, "requests": len(events), "peakConcurrency": peak}
+        f.write(json.dumps(header) + "\n")
+        previous = events[0][0] if events else 0
+        for arrival, entry in events:
+            event = {
+                "dt": round((arrival - previous) * 1000, 1),  # ms since previous request
+                "m": entry["method"],
+                "r": entry["route"],
+            }
+            if entry.get("query"):
+                event["q"] = entry["query"]
+            if entry.get("bodyShape"):
+                event["b"] = entry["bodyShape"]
+            f.write(json.dumps(event, separators=(",", ":")) + "\n")
+            previous = arrival
+
+    duration = events[-1][0] - events[0][0] if len(events) > 1 else 0
+    print(f"✅ Recorded {len(events)} requests spanning {duration:.1f}s (peak {peak} in flight) -> {output_path}")
+    return len(events)
+
+
+def load_trace(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version: {header.get('version')}")
+        events = [json.loads(line) for line in f if line.strip()]
+    for event in events:
+        event["r"] = normalize_route(event["r"])
+    return header, events
+
+
+def auto_workers(header, events, speed):
+    """Enough threads that the pool never caps the recorded arrival rate.
+    Speeding up a trace raises concurrency proportionally (same service times);
+    max speed releases everything at once."""
+    if speed is None:
+        needed = len(events)
+    else:
+        needed = math.ceil(header.get("peakConcurrency", 0) * max(speed, 1.0) * 2)
+    return max(16, min(MAX_AUTO_WORKERS, needed))
+
+# ==================== REPLAY ====================
+
+def synthesize(shape, field=""):
+    """Build a request body matching a recorded payload shape"""
+    if isinstance(shape, dict):
+        return {key: synthesize(value, key) for key, value in shape.items()}
+    if shape == "number":
+        return random.randint(1, 10)
+    if shape == "boolean":
+        return True
+    if shape == "array":
+        return []
+    if shape == "null":
+        return None
+    # Strings: keep fields the backend validates well-formed
+    if field == "record_date":
+        return date.today().isoformat()
+    if field == "record_time":
+        return f"{random.randint(0, 23):02d}:{random.randint(0, 59):02d}"
+    if field == "email":
+        return f"replay_{time.time_ns()}_{random.randint(0, 9999)}@test.com"
+    if field == "password":
+        return "Replay123!"
+    return f"replay {field}"
+
+
+QUERY_VALUES = {
+    "since": "1970-01-01T00:00:00.000Z",
+    "limit": "50",
+}
+
+
+class Replayer:
+    def __init__(self, target, speed, workers, seed_records, timeout):
+        self.target = target.rstrip("/")
+        self.speed = speed  # None = max speed
+        self.workers = workers
+        self.seed_records = seed_records
+        self.timeout = timeout
+        self.token = None
+        self.record_ids = []
+        self.ids_lock = threading.Lock()
+        self.local = threading.local()
+        self.results = []
+        self.results_lock = threading.Lock()
+
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def setup(self):
+        """Register a replay user and seed records so :id routes have targets"""
+        email = f"replay_{int(time.time())}@test.com"
+        r = requests.post(f"{self.target}/api/auth/register",
+                          json={"email": email, "password": "Replay123!"}, timeout=10)
+        r.raise_for_status()
+        self.token = r.json()["data"]["token"]
+
+        for _ in range(self.seed_records):
+            body = synthesize({"record_date": "string", "record_time": "string",
+                               "symptoms": "string", "site": "string", "severity": "number"})
+            r = self.session().post(f"{self.target}/api/health-records", json=body,
+                                    headers=self.headers(), timeout=10)
+            r.raise_for_status()
+            self.record_ids.append(r.json()["data"]["id"])
+        print(f"🔧 Replay user {email}, {len(self.record_ids)} seed records")
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def pick_id(self):
+        with self.ids_lock:
+            return random.choice(self.record_ids) if self.record_ids else 1
+
+    def build_request(self, event):
+        path = event["r"]
+        for param in (":id", ":recordId"):
+            if param in path:
+                path = path.replace(param, str(self.pick_id()))
+        params = {key: QUERY_VALUES.get(key, "1") for key in event.get("q", [])}
+        body = synthesize(event["b"]) if "b" in event else None
+        return event["m"], f"{self.target}{path}", params, body
+
+    def send(self, event, intended):
+        method, url, params, body = self.build_request(event)
+        sent = time.perf_counter()
+        status = 0
+        try:
+            r = self.session().request(method, url, params=params, json=body,
+                                       headers=self.headers(), timeout=self.timeout)
+            status = r.status_code
+            if method == "POST" and event["r"] == "/api/health-records" and r.status_code == 201:
+                with self.ids_lock:
+                    self.record_ids.append(r.json()["data"]["id"])
+            elif method == "DELETE" and r.status_code == 200:
+                with self.ids_lock:
+                    record_id = int(url.rsplit("/", 1)[-1])
+                    if record_id in self.record_ids and len(self.record_ids) > 1:
+                        self.record_ids.remove(record_id)
+        except requests.exceptions.RequestException:
+            status = 0
+        done = time.perf_counter()
+
+        with self.results_lock:
+            self.results.append({
+                "route": f"{event['m']} {event['r']}",
+                "status": status,
+                "lag_ms": (sent - intended) * 1000,
+                "service_ms": (done - sent) * 1000,
+                "response_ms": (done - intended) * 1000,
+            })
+
+    def run(self, events):
+        """Open-loop: each request is released at its trace time regardless of
+        whether earlier requests have completed"""
+        self.setup()
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        start = time.perf_counter()
+        offset = 0.0
+
+        for event in events:
+            if self.speed is not None:
+                offset += event["dt"] / 1000.0 / self.speed
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            intended = start + offset
+            pool.submit(self.send, event, intended)
+
+        pool.shutdown(wait=True)
+        return time.perf_counter() - start
+
+# ==================== REPORT ====================
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    # Nearest-rank: smallest value with at least p% of samples at or below it
+    ordered = sorted(values)
+    # (rounded first so float noise like 999.0000000000001 doesn't skip a rank)
+    rank = math.ceil(round(p * len(ordered) / 100.0, 9))
+    return ordered[max(0, rank - 1)]
+
+
+def summarize(results, elapsed):
+    groups = defaultdict(list)
+    for result in results:
+        groups[result["route"]].append(result)
+    groups["ALL"] = results
+
+    summary = {}
+    for route, items in groups.items():
+        service = [i["service_ms"] for i in items]
+        response = [i["response_ms"] for i in items]
+        summary[route] = {
+            "count": len(items),
+            "errors": sum(1 for i in items if i["status"] == 0 or i["status"] >= 500),
+            "service_ms": {f"p{p}": round(percentile(service, p), 1) for p in (50, 90, 99, 99.9)},
+            "response_ms": {f"p{p}": round(percentile(response, p), 1) for p in (50, 90, 99, 99.9)},
+            "max_response_ms": round(max(response), 1) if response else 0.0,
+        }
+    summary["ALL"]["throughput_rps"] = round(len(results) / elapsed, 2) if elapsed > 0 else 0.0
+    # Send lag > 0 means the generator, not the server, delayed requests (open loop broken)
+    lag = [r["lag_ms"] for r in results]
+    summary["ALL"]["send_lag_ms"] = {
+        "p50": round(percentile(lag, 50), 1),
+        "p99": round(percentile(lag, 99), 1),
+        "max": round(max(lag), 1) if lag else 0.0,
+    }
+    return summary
+
+
+def print_report(summary, elapsed, paced=True):
+    print(f"\n{'='*100}")
+    print(f"REPLAY REPORT ({elapsed:.1f}s)")
+    print("service = from send, response = from intended send (coordinated-omission corrected)")
+    print('='*100)
+    print(f"{'route':<42} {'count':>6} {'err':>5} {'svc p50':>9} {'svc p99':>9} "
+          f"{'resp p50':>9} {'resp p99':>9} {'resp p99.9':>10}")
+    for route in sorted(summary, key=lambda r: (r == "ALL", r)):
+        s = summary[route]
+        print(f"{route:<42} {s['count']:>6} {s['errors']:>5} "
+              f"{s['service_ms']['p50']:>9.1f} {s['service_ms']['p99']:>9.1f} "
+              f"{s['response_ms']['p50']:>9.1f} {s['response_ms']['p99']:>9.1f} "
+              f"{s['response_ms']['p99.9']:>10.1f}")
+    print(f"\nThroughput: {summary['ALL']['throughput_rps']} req/s")
+    lag = summary["ALL"]["send_lag_ms"]
+    print(f"Send lag (scheduled -> sent): p50 {lag['p50']} ms, p99 {lag['p99']} ms, max {lag['max']} ms")
+    if paced and lag["p99"] > LAG_WARNING_MS:
+        print("⚠️  The replayer fell behind the trace schedule; the server saw less load than recorded. "
+              "Raise --workers.")
+
+# ==================== CLI ====================
+
+def parse_speed(value):
+    if value == "max":
+        return None
+    speed = float(value.rstrip("x"))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay backend request traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Build a trace file from a backend request log")
+    rec.add_argument("log", help="Backend stdout log (JSON lines, optionally .gz)")
+    rec.add_argument("-o", "--output", default="requests.trace.gz")
+
+    rep = sub.add_parser("replay", help="Replay a trace file against a target")
+    rep.add_argument("trace")
+    rep.add_argument("--target", default=BACKEND_URL)
+    rep.add_argument("--speed", type=parse_speed, default=1.0, help="1, 10, 10x, ... or 'max'")
+    rep.add_argument("--workers", type=int, help="Concurrent senders (default: sized from the trace's peak concurrency)")
+    rep.add_argument("--seed-records", type=int, default=5)
+    rep.add_argument("--timeout", type=float, default=130.0)
+    rep.add_argument("--json", action="store_true", help="Print the summary as JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        return 0 if record_trace(args.log, args.output) > 0 else 1
+
+    header, events = load_trace(args.trace)
+    workers = args.workers or auto_workers(header, events, args.speed)
+    speed_label = "max" if args.speed is None else f"{args.speed:g}x"
+    print(f"🚀 Replaying {len(events)} requests against {args.target} at {speed_label} ({workers} workers)")
+
+    replayer = Replayer(args.target, args.speed, workers, args.seed_records, args.timeout)
+    elapsed = replayer.run(events)
+    summary = summarize(replayer.results, elapsed)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary, elapsed, paced=args.speed is not None)
+    return 0 if summary["ALL"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
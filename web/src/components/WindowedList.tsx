@@ -0,0 +1,142 @@
+import React, { useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react';
+
+interface WindowedListProps<T> {
+  items: T[];
+  getKey: (item: T) => React.Key;
+  renderItem: (item: T) => React.ReactNode;
+  estimatedItemHeight?: number;
+  gap?: number;
+  overscan?: number;
+  className?: string;
+}
+
+interface MeasuredItemProps {
+  itemKey: string;
+  observer: ResizeObserver | null;
+  gap: number;
+  children: React.ReactNode;
+}
+
+const MeasuredItem: React.FC<MeasuredItemProps> = ({ itemKey, observer, gap, children }) => {
+  const ref = useRef<HTMLDivElement>(null);
+
+  useLayoutEffect(() => {
+    const element = ref.current;
+    if (!element || !observer) return;
+    observer.observe(element);
+    return () => observer.unobserve(element);
+  }, [observer]);
+
+  return (
+    <div ref={ref} data-key={itemKey} style={{ paddingBottom: gap }}>
+      {children}
+    </div>
+  );
+};
+
+// First index whose bottom edge is below `position` (offsets are cumulative and sorted)
+const findIndex = (offsets: number[], position: number): number => {
+  let low = 0;
+  let high = offsets.length - 1;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (offsets[mid + 1] <= position) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+};
+
+/**
+ * Virtualized list for variable-height cards scrolled with the page: only items
+ * within `overscan` px of the viewport are mounted, the rest are replaced by
+ * top/bottom padding. Heights are measured with ResizeObserver once an item has
+ * rendered and estimated until then.
+ */
+function WindowedList<T>({
+  items,
+  getKey,
+  renderItem,
+  estimatedItemHeight = 220,
+  gap = 16,
+  overscan = 800,
+  className
+}: WindowedListProps<T>) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const heights = useRef(new Map<string, number>());
+  const [, setMeasured] = useState(0);
+  const [viewport, setViewport] = useState({ top: 0, height: window.innerHeight });
+
+  // Track which slice of the list is on screen
+  useEffect(() => {
+    let frame = 0;
+    const update = () => {
+      frame = 0;
+      const rect = containerRef.current?.getBoundingClientRect();
+      if (rect) {
+        setViewport({ top: -rect.top, height: window.innerHeight });
+      }
+    };
+    const schedule = () => {
+      if (!frame) frame = requestAnimationFrame(update);
+    };
+
+    update();
+    window.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule);
+    return () => {
+      cancelAnimationFrame(frame);
+      window.removeEventListener('scroll', schedule);
+      window.removeEventListener('resize', schedule);
+    };
+  }, []);
+
+  const observer = useMemo(() => {
+    if (typeof ResizeObserver === 'undefined') return null;
+    return new ResizeObserver(entries => {
+      let changed = false;
+      for (const entry of entries) {
+        const key = (entry.target as HTMLElement).dataset.key!;
+        const height = (entry.target as HTMLElement).offsetHeight;
+        if (height > 0 && heights.current.get(key) !== height) {
+          heights.current.set(key, height);
+          changed = true;
+        }
+      }
+      if (changed) setMeasured(count => count + 1);
+    });
+  }, []);
+
+  useEffect(() => () => observer?.disconnect(), [observer]);
+
+  const keys = items.map(item => String(getKey(item)));
+  const offsets = new Array<number>(items.length + 1);
+  offsets[0] = 0;
+  keys.forEach((key, index) => {
+    offsets[index + 1] = offsets[index] + (heights.current.get(key) ?? estimatedItemHeight + gap);
+  });
+  const total = offsets[items.length];
+
+  const start = items.length === 0 ? 0 : findIndex(offsets, viewport.top - overscan);
+  const end = items.length === 0
+    ? 0
+    : Math.min(items.length, findIndex(offsets, viewport.top + viewport.height + overscan) + 1);
+
+  return (
+    <div
+      ref={containerRef}
+      className={className}
+      style={{ paddingTop: offsets[start], paddingBottom: total - offsets[end] }}
+    >
+      {items.slice(start, end).map((item, index) => (
+        <MeasuredItem key={keys[start + index]} itemKey={keys[start + index]} observer={observer} gap={gap}>
+          {renderItem(item)}
+        </MeasuredItem>
+      ))}
+    </div>
+  );
+}
+
+export default WindowedList;
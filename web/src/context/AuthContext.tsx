@@ -1,4 +1,5 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import { syncService } from '@/services/syncService';
 import type { User } from '@/types';
 
 interface AuthContextType {
@@ -6,7 +7,7 @@ interface AuthContextType {
   isAuthenticated: boolean;
   isLoading: boolean;
   login: (user: User) => void;
-  logout: () => void;
+  logout: () => Promise<boolean>;
 }
 
 const AuthContext = createContext<AuthContextType | undefined>(undefined);
@@ -54,6 +55,8 @@ function AuthProvider({ children }: AuthProviderProps) {
     const handleStorageChange = (e: StorageEvent) => {
       if (e.key === 'authToken' && !e.newValue) {
         console.log('Auth token removed, logging out user');
+        // The offline store is shared across tabs; whoever logged out already cleaned it up,
+        // and an expired token (401) must not discard unsynced changes
         setUser(null);
       }
     };
@@ -67,10 +70,22 @@ function AuthProvider({ children }: AuthProviderProps) {
     localStorage.setItem('userData', JSON.stringify(userData));
   };
 
-  const logout = () => {
+  // Resolves false if the user chose to stay signed in to keep unsynced offline changes
+  const logout = async (): Promise<boolean> => {
+    await syncService.flushOutbox();
+    const pending = await syncService.pendingChanges();
+    if (pending > 0 && !window.confirm(
+      `${pending} offline change${pending === 1 ? '' : 's'} could not be synced and will be lost if you log out. Log out anyway?`
+    )) {
+      return false;
+    }
+
+    // Cached health data must not outlive the session (needs userData to find this account's entries)
+    await syncService.discardLocalData().catch(error => console.warn('Failed to clear offline store:', error));
     setUser(null);
     localStorage.removeItem('authToken');
     localStorage.removeItem('userData');
+    return true;
   };
 
   const value = {
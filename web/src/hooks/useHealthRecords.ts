@@ -1,5 +1,5 @@
 import { useEffect } from 'react'
-import { healthRecordsApi } from '@/services/api'
+import { syncService } from '@/services/syncService'
 import { useHealthStore } from '@/store/useHealthStore'
 import type { HealthRecord, CreateHealthRecordData } from '@/types'
 
@@ -17,19 +17,34 @@ export function useHealthRecords() {
     clearError 
   } = useHealthStore()
 
-  // Fetch records on mount
+  // Fetch records on mount, and replay queued offline changes when connectivity returns
   useEffect(() => {
     fetchRecords()
+
+    const handleOnline = () => { fetchRecords() }
+    window.addEventListener('online', handleOnline)
+    return () => window.removeEventListener('online', handleOnline)
   }, [])
 
   const fetchRecords = async () => {
+    let hasCached = false
     try {
-      setLoading(true)
       clearError()
-      const data = await healthRecordsApi.getRecords()
+      // Render from IndexedDB immediately, then delta-sync in the background
+      const cached = await syncService.loadCached()
+      hasCached = cached.length > 0
+      if (hasCached) {
+        setRecords(cached)
+      } else {
+        setLoading(true)
+      }
+      const data = await syncService.sync()
       setRecords(data)
     } catch (err: any) {
-      setError(err.response?.data?.error || 'Failed to fetch health records')
+      // Offline with a cached journal is not an error
+      if (!hasCached) {
+        setError(err.response?.data?.error || 'Failed to fetch health records')
+      }
     } finally {
       setLoading(false)
     }
@@ -38,7 +53,7 @@ export function useHealthRecords() {
   const createRecord = async (data: CreateHealthRecordData): Promise<HealthRecord> => {
     try {
       clearError()
-      const newRecord = await healthRecordsApi.createRecord(data)
+      const newRecord = await syncService.createRecord(data)
       addRecord(newRecord)
       return newRecord
     } catch (err: any) {
@@ -51,7 +66,7 @@ export function useHealthRecords() {
   const updateHealthRecord = async (id: number, data: CreateHealthRecordData): Promise<HealthRecord> => {
     try {
       clearError()
-      const updatedRecord = await healthRecordsApi.updateRecord(id, data)
+      const updatedRecord = await syncService.updateRecord(id, data)
       updateRecord(id, updatedRecord)
       return updatedRecord
     } catch (err: any) {
@@ -64,7 +79,7 @@ export function useHealthRecords() {
   const deleteHealthRecord = async (id: number): Promise<void> => {
     try {
       clearError()
-      await healthRecordsApi.deleteRecord(id)
+      await syncService.deleteRecord(id)
       deleteRecord(id)
     } catch (err: any) {
       const errorMessage = err.response?.data?.error || 'Failed to delete health record'
@@ -76,8 +91,11 @@ export function useHealthRecords() {
   const getRecord = async (id: number): Promise<HealthRecord> => {
     try {
       clearError()
-      return await healthRecordsApi.getRecord(id)
+      return await syncService.refreshRecord(id)
     } catch (err: any) {
+      const { record } = await syncService.getCachedRecord(id)
+      if (record) return record
+
       const errorMessage = err.response?.data?.error || 'Failed to fetch health record'
       setError(errorMessage)
       throw err
@@ -21,9 +21,9 @@ const AppLayout: React.FC = () => {
     return location.pathname.startsWith(path);
   };
 
-  const handleLogout = () => {
+  const handleLogout = async () => {
+    if (!(await logout())) return;
     authApi.logout();
-    logout();
     navigate('/login');
   };
 
@@ -1,11 +1,11 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { healthRecordsApi } from '@/services/api';
+import { syncService } from '@/services/syncService';
 import Button from '@/components/ui/Button';
 import Input from '@/components/ui/Input';
 import Card from '@/components/ui/Card';
 import { ArrowLeft, Save } from 'lucide-react';
-import type { CreateHealthRecordData } from '@/types';
+import type { CreateHealthRecordData, HealthRecord } from '@/types';
 
 const EditRecordPage: React.FC = () => {
   const { id } = useParams<{ id: string }>();
@@ -39,40 +39,64 @@ const EditRecordPage: React.FC = () => {
     personal_notes: ''
   });
 
+  // Set once the user types, so a late revalidation never overwrites their edits
+  const edited = useRef(false);
+
   useEffect(() => {
+    const applyRecord = (record: HealthRecord) => {
+      setFormData({
+        record_date: record.record_date,
+        record_time: record.record_time,
+        site: record.site || '',
+        onset: record.onset || '',
+        character: record.character || '',
+        radiation: record.radiation || '',
+        associations: record.associations || '',
+        time_course: record.time_course || '',
+        exacerbating_factors: record.exacerbating_factors || '',
+        severity: record.severity || 1,
+        palliating_factors: record.palliating_factors || '',
+        quality: record.quality || '',
+        region: record.region || '',
+        symptoms: record.symptoms || '',
+        medications: record.medications || '',
+        diet_notes: record.diet_notes || '',
+        vital_signs: record.vital_signs || {
+          blood_pressure: '',
+          temperature: '',
+          pulse: '',
+          weight: ''
+        },
+        personal_notes: record.personal_notes || ''
+      });
+    };
+
     const fetchRecord = async () => {
       if (!id) return;
+      const recordId = parseInt(id);
       
+      setFetchLoading(true);
+      const cached = await syncService.getCachedRecord(recordId);
+      if (cached.record) {
+        applyRecord(cached.record);
+        setFetchLoading(false);
+      }
+
+      // Queued offline creates are not on the server yet
+      if (recordId < 0 && cached.record) return;
+
+      // Saving replaces the whole record, so always start from the server's latest version
       try {
-        setFetchLoading(true);
-        const record = await healthRecordsApi.getRecord(parseInt(id));
-        setFormData({
-          record_date: record.record_date,
-          record_time: record.record_time,
-          site: record.site || '',
-          onset: record.onset || '',
-          character: record.character || '',
-          radiation: record.radiation || '',
-          associations: record.associations || '',
-          time_course: record.time_course || '',
-          exacerbating_factors: record.exacerbating_factors || '',
-          severity: record.severity || 1,
-          palliating_factors: record.palliating_factors || '',
-          quality: record.quality || '',
-          region: record.region || '',
-          symptoms: record.symptoms || '',
-          medications: record.medications || '',
-          diet_notes: record.diet_notes || '',
-          vital_signs: record.vital_signs || {
-            blood_pressure: '',
-            temperature: '',
-            pulse: '',
-            weight: ''
-          },
-          personal_notes: record.personal_notes || ''
-        });
+        const record = await syncService.refreshRecord(recordId);
+        if (!edited.current) {
+          applyRecord(record);
+        } else if (record.updated_at !== cached.record?.updated_at) {
+          setError('This record was changed elsewhere while you were editing. Saving will overwrite those changes.');
+        }
       } catch (err) {
-        setError('Failed to fetch record details');
+        if (!cached.record) {
+          setError('Failed to fetch record details');
+        }
         console.error('Error fetching record:', err);
       } finally {
         setFetchLoading(false);
@@ -83,6 +107,7 @@ const EditRecordPage: React.FC = () => {
   }, [id]);
 
   const handleInputChange = (field: keyof CreateHealthRecordData, value: any) => {
+    edited.current = true;
     setFormData(prev => ({ ...prev, [field]: value }));
   };
 
@@ -101,8 +126,8 @@ const EditRecordPage: React.FC = () => {
     setError(null);
     
     try {
-      // Note: This would require implementing updateRecord in the API service
-      // await healthRecordsApi.updateRecord(parseInt(id), formData);
+      // Saved locally and queued for replay when offline
+      await syncService.updateRecord(parseInt(id), formData);
       navigate(`/dashboard/records/${id}`);
     } catch (error: any) {
       console.error('Failed to update record:', error);
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { healthRecordsApi } from '@/services/api';
+import { syncService } from '@/services/syncService';
 import Button from '@/components/ui/Button';
 import Card from '@/components/ui/Card';
 import MarkdownText from '@/components/ui/MarkdownText';
@@ -23,16 +24,25 @@ const RecordDetailPage: React.FC = () => {
     const fetchRecord = async () => {
       if (!id) return;
       
+      // Show the locally stored copy first, then revalidate against the server
+      const cached = await syncService.getCachedRecord(parseInt(id));
+      if (cached.record) {
+        setRecord(cached.record);
+        setAnalysis(cached.analysis || null);
+        setLoading(false);
+      }
+      
       try {
-        setLoading(true);
-        const data = await healthRecordsApi.getRecord(parseInt(id));
+        const data = await syncService.refreshRecord(parseInt(id));
         setRecord(data);
         
         if (data.ai_analysis) {
           setAnalysis(data.ai_analysis);
         }
       } catch (err) {
-        setError('Failed to fetch record details');
+        if (!cached.record) {
+          setError('Failed to fetch record details');
+        }
         console.error('Error fetching record:', err);
       } finally {
         setLoading(false);
@@ -51,6 +61,7 @@ const RecordDetailPage: React.FC = () => {
       const result = await healthRecordsApi.getAnalysis(record.id);
       setAnalysis(result);
       setRecord(prev => prev ? { ...prev, ai_analysis: result } : null);
+      syncService.saveAnalysis(record, result).catch(err => console.warn('Failed to store analysis offline:', err));
     } catch (err) {
       console.error('Analysis failed:', err);
       setError('Failed to generate AI analysis');
@@ -64,7 +75,7 @@ const RecordDetailPage: React.FC = () => {
     
     setDeleteLoading(true);
     try {
-      await healthRecordsApi.deleteRecord(record.id);
+      await syncService.deleteRecord(record.id);
       navigate('/records');
     } catch (err) {
       console.error('Delete failed:', err);
@@ -2,6 +2,7 @@ import React, { useState } from 'react';
 import { useHealthRecords } from '@/hooks/useHealthRecords';
 import { healthRecordsApi } from '@/services/api';
 import HealthRecordCard from '@/components/HealthRecordCard';
+import WindowedList from '@/components/WindowedList';
 import Button from '@/components/ui/Button';
 import { useNavigate } from 'react-router-dom';
 import { Search, Plus } from 'lucide-react';
@@ -88,27 +89,29 @@ const RecordsPage: React.FC = () => {
       )}
 
       {/* Records List */}
-      <div className="space-y-4">
-        {filteredRecords.length === 0 ? (
-          <div className="text-center py-12 bg-card rounded-lg border border-border">
-            <div className="text-muted-foreground text-lg mb-4">No records found</div>
-            <p className="text-muted-foreground mb-6">
-              {searchTerm ? 'Try adjusting your search terms' : 'Start tracking your health by creating your first record'}
-            </p>
-            <Button onClick={() => navigate('/dashboard/records/new')}>
-              Create First Record
-            </Button>
-          </div>
-        ) : (
-          filteredRecords.map((record) => (
+      {filteredRecords.length === 0 ? (
+        <div className="text-center py-12 bg-card rounded-lg border border-border">
+          <div className="text-muted-foreground text-lg mb-4">No records found</div>
+          <p className="text-muted-foreground mb-6">
+            {searchTerm ? 'Try adjusting your search terms' : 'Start tracking your health by creating your first record'}
+          </p>
+          <Button onClick={() => navigate('/dashboard/records/new')}>
+            Create First Record
+          </Button>
+        </div>
+      ) : (
+        <WindowedList
+          items={filteredRecords}
+          getKey={(record) => record.id}
+          renderItem={(record) => (
             <HealthRecordCard
-              key={record.id}
               record={record}
               onAnalyze={handleAnalyze}
             />
-          ))
-        )}
-      </div>
+          )}
+          gap={16}
+        />
+      )}
 
       {/* AI Analysis Modal */}
       {analysis && (
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { AuthResponse, HealthRecord, CreateHealthRecordData, ApiResponse, HealthAnalysis } from '@/types';
+import type { AuthResponse, HealthRecord, CreateHealthRecordData, ApiResponse, HealthAnalysis, RecordDelta } from '@/types';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 
   (import.meta.env.PROD ? 'https://health-journal-backend.vercel.app/api' : 'http://localhost:3001/api');
@@ -63,6 +63,12 @@ export const healthRecordsApi = {
     return response.data.data!;
   },
 
+  // Delta sync: records changed and ids deleted after the cursor
+  getChanges: async (since: string): Promise<RecordDelta> => {
+    const response = await api.get<ApiResponse<RecordDelta>>('/health-records', { params: { since } });
+    return response.data.data!;
+  },
+
   createRecord: async (data: CreateHealthRecordData): Promise<HealthRecord> => {
     const response = await api.post<ApiResponse<HealthRecord>>('/health-records', data);
     const newRecord = response.data.data!;
@@ -0,0 +1,177 @@
+import type { HealthRecord, HealthAnalysis, CreateHealthRecordData } from '@/types';
+
+const DB_NAME = 'health-journal';
+const DB_VERSION = 1;
+
+type StoreName = 'records' | 'analyses' | 'outbox' | 'meta';
+
+// Entries are tagged with the account that queued them (only replayed under that account)
+// and count server-side failures (`attempts`) so replay can give up on a poisoned entry
+export type OutboxEntry =
+  | { seq?: number; userId: number; attempts?: number; type: 'create'; tempId: number; data: CreateHealthRecordData; queuedAt: string }
+  | { seq?: number; userId: number; attempts?: number; type: 'update'; id: number; data: CreateHealthRecordData; queuedAt: string };
+
+let dbPromise: Promise<IDBDatabase> | null = null;
+
+const isSupported = (): boolean => typeof indexedDB !== 'undefined';
+
+const openDb = (): Promise<IDBDatabase> => {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+      request.onupgradeneeded = () => {
+        const db = request.result;
+        db.createObjectStore('records', { keyPath: 'id' });
+        db.createObjectStore('analyses', { keyPath: 'recordId' });
+        db.createObjectStore('outbox', { keyPath: 'seq', autoIncrement: true });
+        db.createObjectStore('meta', { keyPath: 'key' });
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        dbPromise = null;
+        reject(request.error);
+      };
+    });
+  }
+  return dbPromise;
+};
+
+const promisify = <T>(request: IDBRequest<T>): Promise<T> =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+/**
+ * Run one transaction; resolves with the callback result once it commits
+ */
+const withStore = async <T>(
+  names: StoreName | StoreName[],
+  mode: IDBTransactionMode,
+  fn: (tx: IDBTransaction) => Promise<T> | T
+): Promise<T> => {
+  const db = await openDb();
+  const tx = db.transaction(names, mode);
+  const done = new Promise<void>((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+  const result = await fn(tx);
+  await done;
+  return result;
+};
+
+const sortRecords = (records: HealthRecord[]): HealthRecord[] =>
+  records.sort((a, b) =>
+    `${b.record_date}${b.record_time}`.localeCompare(`${a.record_date}${a.record_time}`)
+  );
+
+// Persistent IndexedDB store for records, analyses and queued offline writes
+export const offlineStore = {
+  isSupported,
+
+  async getRecords(): Promise<HealthRecord[]> {
+    if (!isSupported()) return [];
+    const records = await withStore('records', 'readonly', tx =>
+      promisify(tx.objectStore('records').getAll() as IDBRequest<HealthRecord[]>)
+    );
+    return sortRecords(records);
+  },
+
+  async getRecord(id: number): Promise<HealthRecord | undefined> {
+    if (!isSupported()) return undefined;
+    return withStore('records', 'readonly', tx =>
+      promisify(tx.objectStore('records').get(id) as IDBRequest<HealthRecord | undefined>)
+    );
+  },
+
+  async putRecords(records: HealthRecord[]): Promise<void> {
+    if (!isSupported() || records.length === 0) return;
+    await withStore('records', 'readwrite', tx => {
+      const store = tx.objectStore('records');
+      records.forEach(record => store.put(record));
+    });
+  },
+
+  async deleteRecords(ids: number[]): Promise<void> {
+    if (!isSupported() || ids.length === 0) return;
+    await withStore(['records', 'analyses'], 'readwrite', tx => {
+      ids.forEach(id => {
+        tx.objectStore('records').delete(id);
+        tx.objectStore('analyses').delete(id);
+      });
+    });
+  },
+
+  async getAnalysis(recordId: number): Promise<HealthAnalysis | undefined> {
+    if (!isSupported()) return undefined;
+    return withStore('analyses', 'readonly', tx =>
+      promisify(tx.objectStore('analyses').get(recordId) as IDBRequest<HealthAnalysis | undefined>)
+    );
+  },
+
+  async putAnalysis(analysis: HealthAnalysis): Promise<void> {
+    if (!isSupported()) return;
+    await withStore('analyses', 'readwrite', tx => {
+      tx.objectStore('analyses').put(analysis);
+    });
+  },
+
+  async getMeta<T>(key: string): Promise<T | undefined> {
+    if (!isSupported()) return undefined;
+    const entry = await withStore('meta', 'readonly', tx =>
+      promisify(tx.objectStore('meta').get(key) as IDBRequest<{ key: string; value: T } | undefined>)
+    );
+    return entry?.value;
+  },
+
+  async setMeta<T>(key: string, value: T): Promise<void> {
+    if (!isSupported()) return;
+    await withStore('meta', 'readwrite', tx => {
+      tx.objectStore('meta').put({ key, value });
+    });
+  },
+
+  async enqueue(entry: OutboxEntry): Promise<void> {
+    await withStore('outbox', 'readwrite', tx => {
+      tx.objectStore('outbox').add(entry);
+    });
+  },
+
+  async getOutbox(): Promise<OutboxEntry[]> {
+    if (!isSupported()) return [];
+    return withStore('outbox', 'readonly', tx =>
+      promisify(tx.objectStore('outbox').getAll() as IDBRequest<OutboxEntry[]>)
+    );
+  },
+
+  async updateOutbox(entry: OutboxEntry): Promise<void> {
+    await withStore('outbox', 'readwrite', tx => {
+      tx.objectStore('outbox').put(entry);
+    });
+  },
+
+  async removeOutbox(seq: number): Promise<void> {
+    await withStore('outbox', 'readwrite', tx => {
+      tx.objectStore('outbox').delete(seq);
+    });
+  },
+
+  // Drop cached records, analyses and sync state; queued offline writes are kept
+  async clearCache(): Promise<void> {
+    if (!isSupported()) return;
+    await withStore(['records', 'analyses', 'meta'], 'readwrite', tx => {
+      (['records', 'analyses', 'meta'] as StoreName[]).forEach(name => tx.objectStore(name).clear());
+    });
+  },
+
+  // Wipe all stores, including unsynced writes
+  async clear(): Promise<void> {
+    if (!isSupported()) return;
+    await withStore(['records', 'analyses', 'outbox', 'meta'], 'readwrite', tx => {
+      (['records', 'analyses', 'outbox', 'meta'] as StoreName[]).forEach(name => tx.objectStore(name).clear());
+    });
+  },
+};
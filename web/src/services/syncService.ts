@@ -0,0 +1,266 @@
+import { healthRecordsApi } from './api';
+import { offlineStore } from './offlineStore';
+import type { HealthRecord, HealthAnalysis, CreateHealthRecordData } from '@/types';
+
+const CURSOR_KEY = 'syncedAt';
+const OWNER_KEY = 'userId';
+const EPOCH = new Date(0).toISOString();
+
+let inFlight: Promise<HealthRecord[]> | null = null;
+let replaying: Promise<void> | null = null;
+
+// Axios errors without a response never reached the server (offline, DNS, timeout)
+const isNetworkError = (error: any): boolean => !error?.response;
+
+// Validation-style rejections: replaying the change again can never succeed
+const REJECTED_STATUSES = [400, 404, 409, 422];
+
+// Server errors tolerated per entry before it is given up, so one bad write can't block the queue
+const MAX_REPLAY_ATTEMPTS = 5;
+
+// Expired/invalid sessions must keep the outbox. Older backends answered them with a bare 400.
+const isAuthError = (error: any): boolean => {
+  const status = error?.response?.status;
+  return status === 401 || status === 403 || /token/i.test(error?.response?.data?.error || '');
+};
+
+const currentUserId = (): number | undefined => {
+  try {
+    return JSON.parse(localStorage.getItem('userData') || 'null')?.id;
+  } catch {
+    return undefined;
+  }
+};
+
+// Never show one account's cached journal to another
+const ensureOwner = async (): Promise<void> => {
+  const userId = currentUserId();
+  // Unknown user (e.g. session just expired): keep everything until someone signs in
+  if (userId === undefined) return;
+
+  const owner = await offlineStore.getMeta<number>(OWNER_KEY);
+  if (owner !== undefined && owner !== userId) {
+    // The previous account's queued writes stay tagged for its next sign-in
+    await offlineStore.clearCache();
+  }
+  if (owner !== userId) {
+    await offlineStore.setMeta(OWNER_KEY, userId);
+  }
+};
+
+const pendingOutbox = async () => {
+  const userId = currentUserId();
+  return (await offlineStore.getOutbox()).filter(entry => entry.userId === userId);
+};
+
+// A refused offline edit leaves an optimistic copy behind; put the server's version back
+const restoreServerCopy = async (id: number): Promise<void> => {
+  try {
+    const record = await healthRecordsApi.getRecord(id);
+    await offlineStore.putRecords([record]);
+  } catch (error: any) {
+    if (error?.response?.status === 404) {
+      await offlineStore.deleteRecords([id]);
+    } else {
+      // Could not fetch it now: force the next sync to start from scratch
+      await offlineStore.setMeta(CURSOR_KEY, EPOCH);
+    }
+  }
+};
+
+/**
+ * Replay queued offline writes in order. Stops at the first failure that may
+ * be transient (offline, expired session, server error) so later edits never
+ * overtake earlier ones. Validation rejections are dropped, as is an entry that
+ * keeps failing with server errors after MAX_REPLAY_ATTEMPTS syncs.
+ */
+const replayEntries = async (): Promise<void> => {
+  for (const entry of await pendingOutbox()) {
+    try {
+      if (entry.type === 'create') {
+        const record = await healthRecordsApi.createRecord(entry.data);
+        await offlineStore.deleteRecords([entry.tempId]);
+        await offlineStore.putRecords([record]);
+      } else {
+        const record = await healthRecordsApi.updateRecord(entry.id, entry.data);
+        await offlineStore.putRecords([record]);
+      }
+      await offlineStore.removeOutbox(entry.seq!);
+    } catch (error: any) {
+      // Offline or signed out: keep the whole outbox for the next sync
+      if (isNetworkError(error) || isAuthError(error)) return;
+
+      const attempts = (entry.attempts || 0) + 1;
+      if (!REJECTED_STATUSES.includes(error.response.status) && attempts < MAX_REPLAY_ATTEMPTS) {
+        await offlineStore.updateOutbox({ ...entry, attempts });
+        return;
+      }
+      console.warn('Dropping offline change rejected by server:', error);
+      await offlineStore.removeOutbox(entry.seq!);
+      if (entry.type === 'create') {
+        await offlineStore.deleteRecords([entry.tempId]);
+      } else {
+        await restoreServerCopy(entry.id);
+      }
+    }
+  }
+};
+
+// Sync and logout may both replay; never send the same queued write twice
+const replayOutbox = (): Promise<void> => {
+  if (!replaying) {
+    replaying = replayEntries().finally(() => {
+      replaying = null;
+    });
+  }
+  return replaying;
+};
+
+const runSync = async (): Promise<HealthRecord[]> => {
+  if (!offlineStore.isSupported()) {
+    return healthRecordsApi.getRecords();
+  }
+
+  await ensureOwner();
+  await replayOutbox();
+
+  const since = (await offlineStore.getMeta<string>(CURSOR_KEY)) || EPOCH;
+  const delta = await healthRecordsApi.getChanges(since);
+  await offlineStore.putRecords(delta.records);
+  await offlineStore.deleteRecords(delta.deleted);
+  await offlineStore.setMeta(CURSOR_KEY, delta.syncedAt);
+
+  return offlineStore.getRecords();
+};
+
+// Offline-first record access: IndexedDB is the read path, the API is synced by updated_at
+export const syncService = {
+  async loadCached(): Promise<HealthRecord[]> {
+    if (!offlineStore.isSupported() || currentUserId() === undefined) return [];
+    try {
+      await ensureOwner();
+      return await offlineStore.getRecords();
+    } catch (error) {
+      console.warn('Offline store unavailable:', error);
+      return [];
+    }
+  },
+
+  // Concurrent callers (several mounted pages) share one sync round-trip
+  sync(): Promise<HealthRecord[]> {
+    if (!inFlight) {
+      inFlight = runSync().finally(() => {
+        inFlight = null;
+      });
+    }
+    return inFlight;
+  },
+
+  async getCachedRecord(id: number): Promise<{ record?: HealthRecord; analysis?: HealthAnalysis }> {
+    if (!offlineStore.isSupported()) return {};
+    try {
+      const [record, analysis] = await Promise.all([
+        offlineStore.getRecord(id),
+        offlineStore.getAnalysis(id)
+      ]);
+      return { record, analysis: record?.ai_analysis || analysis };
+    } catch {
+      return {};
+    }
+  },
+
+  async refreshRecord(id: number): Promise<HealthRecord> {
+    const record = await healthRecordsApi.getRecord(id);
+    await offlineStore.putRecords([record]).catch(() => undefined);
+    return record;
+  },
+
+  async saveAnalysis(record: HealthRecord, analysis: HealthAnalysis): Promise<void> {
+    if (!offlineStore.isSupported()) return;
+    await offlineStore.putAnalysis({ ...analysis, recordId: record.id });
+    await offlineStore.putRecords([{ ...record, ai_analysis: analysis }]);
+  },
+
+  async createRecord(data: CreateHealthRecordData): Promise<HealthRecord> {
+    try {
+      const record = await healthRecordsApi.createRecord(data);
+      await offlineStore.putRecords([record]).catch(() => undefined);
+      return record;
+    } catch (error) {
+      const userId = currentUserId();
+      if (!isNetworkError(error) || !offlineStore.isSupported() || userId === undefined) throw error;
+
+      // Offline: keep a local record under a temporary negative id and replay later
+      const now = new Date().toISOString();
+      const tempId = -Date.now();
+      const record: HealthRecord = { ...data, id: tempId, user_id: userId, created_at: now, updated_at: now };
+      await offlineStore.putRecords([record]);
+      await offlineStore.enqueue({ userId, type: 'create', tempId, data, queuedAt: now });
+      return record;
+    }
+  },
+
+  async updateRecord(id: number, data: CreateHealthRecordData): Promise<HealthRecord> {
+    const now = new Date().toISOString();
+    const merge = async (): Promise<HealthRecord> => {
+      const existing = await offlineStore.getRecord(id);
+      const record = { ...existing, ...data, id, updated_at: now } as HealthRecord;
+      await offlineStore.putRecords([record]);
+      return record;
+    };
+
+    // Not on the server yet: fold the edit into the queued create
+    if (id < 0) {
+      const pending = (await offlineStore.getOutbox()).find(e => e.type === 'create' && e.tempId === id);
+      if (pending) {
+        await offlineStore.updateOutbox({ ...pending, data });
+      }
+      return merge();
+    }
+
+    try {
+      const record = await healthRecordsApi.updateRecord(id, data);
+      await offlineStore.putRecords([record]).catch(() => undefined);
+      return record;
+    } catch (error) {
+      const userId = currentUserId();
+      if (!isNetworkError(error) || !offlineStore.isSupported() || userId === undefined) throw error;
+      await offlineStore.enqueue({ userId, type: 'update', id, data, queuedAt: now });
+      return merge();
+    }
+  },
+
+  async deleteRecord(id: number): Promise<void> {
+    if (id < 0) {
+      const pending = (await offlineStore.getOutbox()).filter(e => e.type === 'create' && e.tempId === id);
+      await Promise.all(pending.map(e => offlineStore.removeOutbox(e.seq!)));
+    } else {
+      await healthRecordsApi.deleteRecord(id);
+    }
+    await offlineStore.deleteRecords([id]).catch(() => undefined);
+  },
+
+  // Number of this account's offline writes not yet on the server
+  async pendingChanges(): Promise<number> {
+    if (!offlineStore.isSupported()) return 0;
+    try {
+      return (await pendingOutbox()).length;
+    } catch {
+      return 0;
+    }
+  },
+
+  // Try to push queued writes now (e.g. right before logout, while the token is still valid)
+  async flushOutbox(): Promise<void> {
+    if (!offlineStore.isSupported()) return;
+    await replayOutbox().catch(error => console.warn('Offline changes not synced:', error));
+  },
+
+  // Logout: drop the cache and this account's unsynced writes
+  async discardLocalData(): Promise<void> {
+    if (!offlineStore.isSupported()) return;
+    const pending = await pendingOutbox();
+    await Promise.all(pending.map(entry => offlineStore.removeOutbox(entry.seq!)));
+    await offlineStore.clearCache();
+  },
+};
@@ -88,4 +88,10 @@ export interface HealthAnalysis {
     frequencyTrend: string;
   };
   redFlags: string[];
-}
\ No newline at end of file
+}
+
+export interface RecordDelta {
+  records: HealthRecord[];
+  deleted: number[];
+  syncedAt: string;
+}